@@ -1,9 +1,13 @@
-def solution(n, m, used) -> str:
-    if m > n:
-        return ' '.join(['1'] * n + ['0'] * (m - n))
-    if m == n:
-        return ' '.join(['1'] * n)
-    
+from array import array
+
+MODES = ("naive", "dc", "aliens", "lean")
+BACKENDS = ("python", "numpy")
+
+# Candidate matrix entries per NumPy block (int64), about 32 MB
+NUMPY_BLOCK = 1 << 22
+
+
+def build_prefix(n, used):
     prefix = [0] * (n + 1)
     for i in range(n):
         prefix[i + 1] = prefix[i] + used[i]
@@ -12,6 +16,281 @@ def solution(n, m, used) -> str:
     for i in range(n):
         weighted_prefix[i + 1] = weighted_prefix[i] + used[i] * (i + 1)
     
+    return prefix, weighted_prefix
+
+def dc_layer(prev, cur, opt, lo, hi, opt_lo, prefix, weighted_prefix):
+    # Fills cur[i] = min(prev[p] + cost(p, i)) for lo <= i <= hi.
+    # The segment cost satisfies the quadrangle inequality (used[i] >= 0), so
+    # the largest optimal split point is monotone in i and can be searched
+    # with divide and conquer. Ties keep the largest p, i.e. the shortest
+    # last segment, which is what the naive backtracking picks.
+    stack = [(lo, hi, opt_lo, hi - 1)]
+    while stack:
+        lo, hi, opt_lo, opt_hi = stack.pop()
+        if lo > hi:
+            continue
+        mid = (lo + hi) // 2
+        end_prefix = prefix[mid]
+        end_weighted = weighted_prefix[mid]
+        best = float('inf')
+        best_p = opt_lo
+        for p in range(opt_lo, min(opt_hi, mid - 1) + 1):
+            value = prev[p] + (end_weighted - weighted_prefix[p]) - p * (end_prefix - prefix[p])
+            if value <= best:
+                best = value
+                best_p = p
+        cur[mid] = best
+        if opt is not None:
+            opt[mid] = best_p
+        stack.append((lo, mid - 1, opt_lo, best_p))
+        stack.append((mid + 1, hi, best_p, opt_hi))
+
+def dc_layer_backward(prev, cur, lo, hi, opt_hi, prefix, weighted_prefix):
+    # Mirror of dc_layer for suffixes: cur[p] = min(cost(p, q) + prev[q]) for
+    # lo <= p <= hi and p < q <= opt_hi. Only the values are needed here.
+    stack = [(lo, hi, lo + 1, opt_hi)]
+    while stack:
+        lo, hi, opt_lo, opt_hi = stack.pop()
+        if lo > hi:
+            continue
+        mid = (lo + hi) // 2
+        start_prefix = prefix[mid]
+        start_weighted = weighted_prefix[mid]
+        best = float('inf')
+        best_q = opt_hi
+        for q in range(max(opt_lo, mid + 1), opt_hi + 1):
+            value = (weighted_prefix[q] - start_weighted) - mid * (prefix[q] - start_prefix) + prev[q]
+            if value < best:
+                best = value
+                best_q = q
+        cur[mid] = best
+        stack.append((lo, mid - 1, opt_lo, best_q))
+        stack.append((mid + 1, hi, best_q, opt_hi))
+
+def solution_lean(n, m, used) -> str:
+    # Hirschberg-style reconstruction: only two DP layers live at a time, in
+    # int64 buffers reused across the whole recursion, so memory is O(n + m).
+    # For a subproblem [lo, hi) with s segments, forward layers give the cost
+    # of splitting [lo, p) into s // 2 segments and backward layers the cost
+    # of the rest; the largest p minimising the sum is where the naive
+    # backtracking passes (optimal splits of a Monge cost are closed under
+    # element-wise max, and the naive scan yields that maximal split).
+    prefix = array('q', [0]) * (n + 1)
+    weighted_prefix = array('q', [0]) * (n + 1)
+    for i in range(n):
+        prefix[i + 1] = prefix[i] + used[i]
+        weighted_prefix[i + 1] = weighted_prefix[i] + used[i] * (i + 1)
+    
+    forward, forward_next = array('q', [0]) * (n + 1), array('q', [0]) * (n + 1)
+    backward, backward_next = array('q', [0]) * (n + 1), array('q', [0]) * (n + 1)
+    
+    result = [0] * m
+    stack = [(0, n, m, 0)]
+    while stack:
+        lo, hi, segments, first = stack.pop()
+        if segments == 1:
+            result[first] = hi - lo
+            continue
+        if segments == hi - lo:
+            for j in range(segments):
+                result[first + j] = 1
+            continue
+        
+        left = segments // 2
+        right = segments - left
+        
+        # The first layer on each side is a single segment anchored at lo or hi
+        for p in range(lo + 1, hi - segments + 2):
+            forward[p] = (weighted_prefix[p] - weighted_prefix[lo]) - lo * (prefix[p] - prefix[lo])
+        for j in range(2, left + 1):
+            dc_layer(forward, forward_next, None, lo + j, hi - (segments - j), lo + j - 1, prefix, weighted_prefix)
+            forward, forward_next = forward_next, forward
+        
+        for p in range(lo + segments - 1, hi):
+            backward[p] = (weighted_prefix[hi] - weighted_prefix[p]) - p * (prefix[hi] - prefix[p])
+        for j in range(2, right + 1):
+            dc_layer_backward(backward, backward_next, lo + (segments - j), hi - j, hi - j + 1, prefix, weighted_prefix)
+            backward, backward_next = backward_next, backward
+        
+        best = float('inf')
+        split = lo + left
+        for p in range(lo + left, hi - right + 1):
+            value = forward[p] + backward[p]
+            if value <= best:
+                best = value
+                split = p
+        
+        stack.append((lo, split, left, first))
+        stack.append((split, hi, right, first + left))
+    
+    return ' '.join(map(str, result))
+
+def solution_dc(n, m, used) -> str:
+    prefix, weighted_prefix = build_prefix(n, used)
+    
+    prev = [float('inf')] * (n + 1)
+    prev[0] = 0
+    opt = [None] * (m + 1)
+    for j in range(1, m + 1):
+        cur = [float('inf')] * (n + 1)
+        opt[j] = [0] * (n + 1)
+        # Layer j only matters where the remaining m - j segments still fit
+        dc_layer(prev, cur, opt[j], j, n - (m - j), j - 1, prefix, weighted_prefix)
+        prev = cur
+    
+    result = [0] * m
+    i = n
+    for j in range(m, 0, -1):
+        start = opt[j][i]
+        result[j - 1] = i - start
+        i = start
+    
+    return ' '.join(map(str, result))
+
+def penalised_pass(n, penalty, sign, prefix, weighted_prefix):
+    # Single-layer DP: best[i] = min(best[p] + cost(p, i) + penalty).
+    # The segment count is folded into the low digits of every value
+    # (value * scale + sign * count), so sign=1 yields the fewest segments
+    # among optimal splits and sign=-1 the most. The transition is
+    # min(-p * prefix[i] + intercept[p]) with decreasing slopes and
+    # non-decreasing queries, which a monotone convex hull trick answers in O(1).
+    scale = n + 1
+    best = [0] * (n + 1)
+    slopes = [0]
+    intercepts = [0]
+    head = 0
+    for i in range(1, n + 1):
+        x = prefix[i]
+        while head + 1 < len(slopes) and slopes[head + 1] * x + intercepts[head + 1] <= slopes[head] * x + intercepts[head]:
+            head += 1
+        best[i] = slopes[head] * x + intercepts[head] + (weighted_prefix[i] + penalty) * scale + sign
+        
+        slope = -i * scale
+        intercept = best[i] + (i * prefix[i] - weighted_prefix[i]) * scale
+        while len(slopes) >= 2:
+            a1, b1 = slopes[-2], intercepts[-2]
+            a2, b2 = slopes[-1], intercepts[-1]
+            if (intercept - b1) * (a1 - a2) > (b2 - b1) * (a1 - slope):
+                break
+            slopes.pop()
+            intercepts.pop()
+        slopes.append(slope)
+        intercepts.append(intercept)
+        head = min(head, len(slopes) - 1)
+    
+    values = [0] * (n + 1)
+    counts = [0] * (n + 1)
+    for i in range(n + 1):
+        count = (sign * best[i]) % scale
+        counts[i] = count
+        values[i] = (best[i] - sign * count) // scale
+    return values, counts
+
+def solution_aliens(n, m, used) -> str:
+    prefix, weighted_prefix = build_prefix(n, used)
+    
+    # The optimal cost is convex and non-increasing in the number of segments,
+    # so some integer penalty per segment makes m segments optimal. Search the
+    # smallest penalty whose fewest-segment optimum uses at most m segments.
+    low, high = 0, weighted_prefix[n] + 1
+    while low < high:
+        penalty = (low + high) // 2
+        _, counts = penalised_pass(n, penalty, 1, prefix, weighted_prefix)
+        if counts[n] <= m:
+            high = penalty
+        else:
+            low = penalty + 1
+    penalty = low
+    
+    values, min_counts = penalised_pass(n, penalty, 1, prefix, weighted_prefix)
+    _, max_counts = penalised_pass(n, penalty, -1, prefix, weighted_prefix)
+    
+    # For every prefix the segment counts of penalised optima form the range
+    # [min_counts[p], max_counts[p]]. A split point p ends an optimal
+    # (j-1)-segment prefix exactly when it is a penalised optimum for i and
+    # j - 1 lies in that range, so scanning p downwards reproduces the naive
+    # tie-breaking. The scan over a segment costs its length: O(n) in total.
+    result = [0] * m
+    i = n
+    for j in range(m, 0, -1):
+        end_prefix = prefix[i]
+        end_weighted = weighted_prefix[i]
+        for p in range(i - 1, -1, -1):
+            segment_sum = (end_weighted - weighted_prefix[p]) - p * (end_prefix - prefix[p])
+            if (values[p] + segment_sum + penalty == values[i]
+                    and min_counts[p] <= j - 1 <= max_counts[p]):
+                result[j - 1] = i - p
+                i = p
+                break
+    
+    return ' '.join(map(str, result))
+
+def solution_numpy(n, m, used) -> str:
+    import numpy as np
+    
+    counts = np.asarray(used, dtype=np.int64)
+    prefix = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=prefix[1:])
+    weighted_prefix = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts * np.arange(1, n + 1, dtype=np.int64), out=weighted_prefix[1:])
+    
+    # cost(p, i) = weighted_prefix[i] - p * prefix[i] + (p * prefix[p] - weighted_prefix[p]),
+    # so a layer is prev[p] + start_term[p] broadcast against the per-i terms.
+    inf = np.int64(1 << 62)
+    positions = np.arange(n + 1, dtype=np.int64)
+    start_term = positions * prefix - weighted_prefix
+    block = max(1, NUMPY_BLOCK // (n + 1))
+    
+    prev = np.full(n + 1, inf, dtype=np.int64)
+    prev[0] = 0
+    opt = np.zeros((m + 1, n + 1), dtype=np.int32)
+    for j in range(1, m + 1):
+        cur = np.full(n + 1, inf, dtype=np.int64)
+        base = prev + start_term
+        last = n - (m - j)
+        for lo in range(j, last + 1, block):
+            hi = min(lo + block, last + 1)
+            ends = positions[lo:hi, None]
+            cand = base[None, :hi] + weighted_prefix[lo:hi, None] - positions[None, :hi] * prefix[lo:hi, None]
+            cand[positions[None, :hi] >= ends] = inf
+            # argmin returns the first minimum; scanning p backwards keeps the
+            # largest split point, matching the naive tie-breaking
+            best_p = (hi - 1) - np.argmin(cand[:, ::-1], axis=1)
+            cur[lo:hi] = cand[np.arange(hi - lo), best_p]
+            opt[j, lo:hi] = best_p
+        prev = cur
+    
+    result = [0] * m
+    i = n
+    for j in range(m, 0, -1):
+        start = int(opt[j, i])
+        result[j - 1] = i - start
+        i = start
+    
+    return ' '.join(map(str, result))
+
+def solution(n, m, used, mode="naive", backend="python") -> str:
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode: {mode}")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    if backend == "numpy" and mode != "naive":
+        raise ValueError("The numpy backend only implements the naive mode")
+    if m > n:
+        return ' '.join(['1'] * n + ['0'] * (m - n))
+    if m == n:
+        return ' '.join(['1'] * n)
+    if mode == "dc":
+        return solution_dc(n, m, used)
+    if mode == "aliens":
+        return solution_aliens(n, m, used)
+    if mode == "lean":
+        return solution_lean(n, m, used)
+    if backend == "numpy":
+        return solution_numpy(n, m, used)
+    
+    prefix, weighted_prefix = build_prefix(n, used)
+    
     dp = [[float('inf')] * (m + 1) for _ in range(n + 1)]
     dp[0][0] = 0
     
@@ -38,6 +317,87 @@ def solution(n, m, used) -> str:
     
     return ' '.join(map(str, result))
 
+class Partitioner:
+    """Answers optimal splits of one usage histogram for any number of buttons.
+    
+    Layer j of the DP does not depend on m, so layers and their split points
+    are computed once (with dc_layer) and kept; asking for a larger m only
+    computes the missing layers, and any m already covered is a backtrack.
+    
+    update() is O(1) plus marking what it invalidates. dp[i][j] only
+    depends on used[:i], so an update at index leaves the prefix sums and
+    every layer valid up to i = index; the next layout() rebuilds the
+    prefix sums after it and recomputes just that suffix of each layer,
+    starting the split point search at the still-valid split point there.
+    """
+    
+    def __init__(self, used):
+        self.n = len(used)
+        self.used = list(used)
+        # Prefix sums for the DP, valid up to prefix_valid
+        self.prefix, self.weighted_prefix = build_prefix(self.n, self.used)
+        self.prefix_valid = self.n
+        self.values = [[0] + [float('inf')] * self.n]
+        self.opt = [None]
+        self.valid = [self.n]
+    
+    def update(self, index, delta):
+        """Add delta to used[index]."""
+        if self.used[index] + delta < 0:
+            raise ValueError("Usage counts must stay non-negative")
+        self.used[index] += delta
+        self.prefix_valid = min(self.prefix_valid, index)
+        for j in range(1, len(self.valid)):
+            self.valid[j] = min(self.valid[j], index)
+    
+    def refresh_prefix(self):
+        # The DP reads every entry of the stale suffix anyway, so running
+        # sums from the still-valid entry cost O(1) each
+        used = self.used
+        prefix = self.prefix
+        weighted_prefix = self.weighted_prefix
+        for i in range(self.prefix_valid + 1, self.n + 1):
+            prefix[i] = prefix[i - 1] + used[i - 1]
+            weighted_prefix[i] = weighted_prefix[i - 1] + used[i - 1] * i
+        self.prefix_valid = self.n
+    
+    def extend(self, m):
+        """Make sure layers 1..m are computed and up to date."""
+        n = self.n
+        m = min(m, n)
+        self.refresh_prefix()
+        for j in range(1, m + 1):
+            if j == len(self.opt):
+                self.values.append([float('inf')] * (n + 1))
+                self.opt.append([0] * (n + 1))
+                self.valid.append(j - 1)
+            valid = self.valid[j]
+            if valid == n:
+                continue
+            opt = self.opt[j]
+            opt_lo = opt[valid] if valid >= j else j - 1
+            dc_layer(self.values[j - 1], self.values[j], opt, max(j, valid + 1), n, opt_lo,
+                     self.prefix, self.weighted_prefix)
+            self.valid[j] = n
+    
+    def layout(self, m) -> str:
+        """Return the optimal split for m buttons, formatted like solution()."""
+        n = self.n
+        if m > n:
+            return ' '.join(['1'] * n + ['0'] * (m - n))
+        if m == n:
+            return ' '.join(['1'] * n)
+        
+        self.extend(m)
+        result = [0] * m
+        i = n
+        for j in range(m, 0, -1):
+            start = self.opt[j][i]
+            result[j - 1] = i - start
+            i = start
+        
+        return ' '.join(map(str, result))
+
 def main():
     n, m = map(int, input().split())
     used = list(map(int, input().split()))
@@ -45,7 +405,9 @@ def main():
     print(result)
 
 def run_tests():
+    import random
     import time
+    import tracemalloc
     
     test_cases = [
         {
@@ -125,6 +487,14 @@ def run_tests():
         }
     ]
 
+    # Every optimised mode and backend is checked against the naive Python DP
+    variants = [(mode, "python") for mode in MODES[1:]]
+    try:
+        import numpy  # noqa: F401
+        variants.append(("naive", "numpy"))
+    except ImportError:
+        print("- numpy is not installed, skipping the numpy backend\n")
+    
     for tc in test_cases:
         lines = tc["input"].strip().split('\n')
         n, m = map(int, lines[0].split())
@@ -141,6 +511,71 @@ def run_tests():
         print(f"  Expected: {tc['expected']}")
         print(f"  Got: {result}")
         print(f"  Time: {execution_time:.3f} seconds\n")
+        
+        for mode, backend in variants:
+            mode_result = solution(n, m, used, mode=mode, backend=backend)
+            if mode_result != result:
+                print(f"✗ {tc['name']} ({mode} mode, {backend} backend)")
+                print(f"  Naive: {result}")
+                print(f"  Got: {mode_result}\n")
+    
+    # Cross-check the optimised modes against the naive DP on random inputs
+    rng = random.Random(2025)
+    mismatches = 0
+    for _ in range(300):
+        n = rng.randint(1, 12)
+        m = rng.randint(1, n)
+        used = [rng.choice((0, 1, 1, 2, 3, 5, 8)) for _ in range(n)]
+        reference = solution(n, m, used)
+        for mode, backend in variants:
+            if solution(n, m, used, mode=mode, backend=backend) != reference:
+                mismatches += 1
+                print(f"✗ {mode} mode ({backend} backend) differs on: {n} {m} {used}")
+    names = ', '.join(f"{mode}/{backend}" for mode, backend in variants)
+    print(f"{'✓' if mismatches == 0 else '✗'} Random cross-check of {names}\n")
+    
+    # One Partitioner must answer every m, in any query order, like solution()
+    mismatches = 0
+    for _ in range(100):
+        n = rng.randint(1, 12)
+        used = [rng.choice((0, 1, 1, 2, 3, 5, 8)) for _ in range(n)]
+        partitioner = Partitioner(used)
+        queries = list(range(1, n + 3))
+        rng.shuffle(queries)
+        for m in queries:
+            if partitioner.layout(m) != solution(n, m, used):
+                mismatches += 1
+                print(f"✗ Partitioner differs on: {n} {m} {used}")
+    print(f"{'✓' if mismatches == 0 else '✗'} Partitioner queries for every m\n")
+    
+    # Point updates must give the same splits as solving the new counts from scratch
+    mismatches = 0
+    for _ in range(100):
+        n = rng.randint(1, 12)
+        used = [rng.choice((0, 1, 1, 2, 3, 5, 8)) for _ in range(n)]
+        partitioner = Partitioner(used)
+        for _ in range(5):
+            index = rng.randrange(n)
+            delta = rng.randint(-used[index], 5)
+            used[index] += delta
+            partitioner.update(index, delta)
+            m = rng.randint(1, n)
+            if partitioner.layout(m) != solution(n, m, used):
+                mismatches += 1
+                print(f"✗ Partitioner differs after update on: {n} {m} {used}")
+    print(f"{'✓' if mismatches == 0 else '✗'} Partitioner incremental updates\n")
+    
+    # Lean mode must keep peak memory linear in n (two int64 layers per side)
+    peaks = []
+    for n in (1000, 2000):
+        used = [rng.randint(0, 100) for _ in range(n)]
+        tracemalloc.start()
+        solution(n, 8, used, mode="lean")
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    linear = all(peak <= 96 * n for peak, n in zip(peaks, (1000, 2000))) and peaks[1] <= 2.2 * peaks[0]
+    print(f"{'✓' if linear else '✗'} Lean mode peak memory")
+    print(f"  Peaks: {peaks[0]} bytes (n=1000), {peaks[1]} bytes (n=2000)\n")
 
 if __name__ == "__main__":
     run_tests()
\ No newline at end of file
@@ -0,0 +1,171 @@
+import argparse
+import io
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from solution import create_table, iter_rows, layout_table, parse_html
+
+# name, rows, cols, max colspan, max rowspan, span probability, whitespace noise
+CASES = [
+    ("small", 20, 10, 3, 3, 0.3, 0.2),
+    ("wide", 50, 400, 5, 2, 0.3, 0.2),
+    ("tall", 5000, 8, 2, 6, 0.3, 0.2),
+    ("spanny", 300, 60, 12, 12, 0.7, 0.2),
+    ("noisy", 500, 40, 3, 3, 0.3, 1.0),
+]
+
+def generate_rows(rng: random.Random, num_rows: int, num_cols: int, max_colspan: int,
+                  max_rowspan: int, span_prob: float) -> List[List[Tuple[int, int]]]:
+    """
+    Generate a random tiling of a num_rows x num_cols grid as span rows.
+
+    Cells in the first column never span rows, so every row starts at least
+    one cell and the rows survive parsing; spans never overlap.
+    """
+    covered = [[False] * num_cols for _ in range(num_rows)]
+    rows = []
+    for r in range(num_rows):
+        row = []
+        c = 0
+        while c < num_cols:
+            if covered[r][c]:
+                c += 1
+                continue
+            colspan = 1
+            rowspan = 1
+            if rng.random() < span_prob:
+                colspan = rng.randint(1, max_colspan)
+                while c + colspan > num_cols or any(covered[r][c:c + colspan]):
+                    colspan -= 1
+                if c > 0:
+                    rowspan = min(rng.randint(1, max_rowspan), num_rows - r)
+            for i in range(r, r + rowspan):
+                for k in range(c, c + colspan):
+                    covered[i][k] = True
+            row.append((colspan, rowspan))
+            c += colspan
+        rows.append(row)
+    return rows
+
+def to_html(rng: random.Random, rows: List[List[Tuple[int, int]]], noise: float) -> str:
+    """Render span rows as HTML, with random whitespace and letter case when noise > 0."""
+    def gap() -> str:
+        if rng.random() >= noise:
+            return ''
+        return ''.join(rng.choice(' \t\n') for _ in range(rng.randint(1, 4)))
+
+    def tag(name: str) -> str:
+        return name.upper() if rng.random() < noise / 4 else name
+
+    parts = [f'<{tag("table")}>', gap()]
+    for row in rows:
+        parts.append(f'<{tag("tr")}>{gap()}')
+        for colspan, rowspan in row:
+            attributes = ''
+            if colspan > 1:
+                attributes += f' colspan{gap()}={gap()}"{colspan}"'
+            if rowspan > 1:
+                attributes += f' rowspan{gap()}={gap()}"{rowspan}"'
+            parts.append(f'<{tag("td")}{attributes}{gap()}>x</{tag("td")}>{gap()}')
+        parts.append(f'</{tag("tr")}>{gap()}\n')
+    parts.append(f'</{tag("table")}>')
+    return ''.join(parts)
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Best wall time over repeat runs, then the tracemalloc peak of one more run."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+def run_case(name: str, num_rows: int, num_cols: int, max_colspan: int, max_rowspan: int,
+             span_prob: float, noise: float, seed: int, repeat: int) -> dict:
+    rng = random.Random(seed)
+    rows = generate_rows(rng, num_rows, num_cols, max_colspan, max_rowspan, span_prob)
+    html = to_html(rng, rows, noise)
+
+    parsed = parse_html(html)
+    assert parsed == rows, f"{name}: parse_html does not round-trip the generated table"
+    table = create_table(parsed)
+
+    phases = {
+        "parse_html": measure(lambda: parse_html(html), repeat),
+        "iter_rows": measure(lambda: list(iter_rows(io.StringIO(html))), repeat),
+        "create_table": measure(lambda: create_table(parsed), repeat),
+        "layout_table": measure(lambda: layout_table(parsed), repeat),
+        "join": measure(lambda: '\n'.join(table), repeat),
+    }
+    return {
+        "params": {
+            "rows": num_rows, "cols": num_cols, "max_colspan": max_colspan,
+            "max_rowspan": max_rowspan, "span_prob": span_prob, "noise": noise, "seed": seed,
+        },
+        "cells": sum(len(row) for row in rows),
+        "html_bytes": len(html),
+        "phases": phases,
+    }
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Return a description of every phase slower than baseline by more than tolerance."""
+    regressions = []
+    for name, case in results["cases"].items():
+        base_case = baseline.get("cases", {}).get(name)
+        if base_case is None:
+            continue
+        for phase, numbers in case["phases"].items():
+            base = base_case["phases"].get(phase)
+            if base is None:
+                continue
+            for metric in ("seconds", "peak_bytes"):
+                if numbers[metric] > base[metric] * (1 + tolerance):
+                    ratio = numbers[metric] / base[metric] if base[metric] else float('inf')
+                    regressions.append(f"{name}/{phase} {metric}: {base[metric]:.6g} -> {numbers[metric]:.6g} ({ratio:.2f}x)")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the HTML table to ASCII pipeline")
+    parser.add_argument("--case", action="append", help="run only these cases (default: all)")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per phase, best one is kept")
+    parser.add_argument("--output", metavar="FILE", help="write the JSON results here (default: stdout)")
+    parser.add_argument("--baseline", metavar="FILE", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown or memory growth over the baseline, as a fraction")
+    args = parser.parse_args()
+
+    results = {"python": sys.version.split()[0], "cases": {}}
+    for case in CASES:
+        name = case[0]
+        if args.case and name not in args.case:
+            continue
+        results["cases"][name] = run_case(*case, seed=args.seed, repeat=args.repeat)
+        phases = results["cases"][name]["phases"]
+        summary = ", ".join(f"{phase} {numbers['seconds'] * 1000:.1f} ms" for phase, numbers in phases.items())
+        print(f"{name}: {summary}", file=sys.stderr)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"✗ {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("✓ No regressions against the baseline", file=sys.stderr)
@@ -1,6 +1,30 @@
 import re
-from typing import List, Tuple
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+import argparse
+import hashlib
+import mmap
+import multiprocessing
+import os
 import sys
+import time
+
+# Bytes read per step by the streaming tokenizer
+CHUNK_SIZE = 1 << 16
+
+# Edge bits of a border point (a corner of the logical grid)
+UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8
+
+# Border characters: the point character for each of the 16 edge bitmasks,
+# then the horizontal and vertical segment characters
+CHARSETS = {
+    'ascii': (' |||-+++-+++-+++', '-', '|'),
+    'unicode': (' │││─┘┐┤─└┌├─┴┬┼', '─', '│'),
+}
+
+_TAG_NAME = re.compile(rb'(/?[A-Za-z][A-Za-z0-9]*)')
+_SPAN_ATTR = re.compile(rb'(colspan|rowspan)\s*=\s*["\']?(\d+)', re.IGNORECASE)
 
 def parse_html(html: str) -> List[List[Tuple[int, int]]]:
     """
@@ -56,6 +80,154 @@ def parse_html(html: str) -> List[List[Tuple[int, int]]]:
     
     return rows
 
+def read_chunks(stream: IO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Read a text or binary stream as a sequence of byte chunks."""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        yield chunk
+
+def iter_tags(chunks: Iterable[bytes]) -> Iterator[Tuple[bytes, memoryview]]:
+    """
+    Yield (name, attributes) for every tag in a stream of byte chunks.
+    
+    Names are lower-cased and keep the leading '/' of closing tags. The
+    attributes are a memoryview into the chunk, valid until the next tag is
+    requested. Only the unfinished tail of a chunk (from its last unclosed
+    '<') is carried over, so memory stays bounded by the chunk size and the
+    longest tag; a single mmap chunk is scanned without any copy.
+    """
+    tail = b''
+    for chunk in chunks:
+        buf = tail + chunk if tail else chunk
+        pos = 0
+        with memoryview(buf) as view:
+            while True:
+                start = buf.find(b'<', pos)
+                if start < 0:
+                    pos = len(buf)
+                    break
+                end = buf.find(b'>', start + 1)
+                if end < 0:
+                    pos = start
+                    break
+                name_match = _TAG_NAME.match(buf, start + 1, end)
+                if not name_match:
+                    # A bare '<' in text: the '>' found may close a real tag
+                    pos = start + 1
+                    continue
+                with view[name_match.end():end] as attributes:
+                    yield name_match.group(1).lower(), attributes
+                pos = end + 1
+        tail = buf[pos:]
+
+def mapped_tags(path: str) -> Iterator[Tuple[bytes, memoryview]]:
+    """
+    Like iter_tags, over a memory-mapped file.
+    
+    The raw bytes are scanned in place: nothing is decoded, normalised or
+    read into a str, so the page cache holds the document rather than the heap.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            tags = iter_tags([mapped])
+            try:
+                yield from tags
+            finally:
+                # Release the views into the map before it is closed
+                tags.close()
+
+def parse_spans(attributes: bytes) -> Tuple[int, int]:
+    """Return (colspan, rowspan) from the attribute bytes (or memoryview) of a <td> tag."""
+    colspan = rowspan = None
+    for name, value in _SPAN_ATTR.findall(attributes):
+        if name.lower() == b'colspan':
+            if colspan is None:
+                colspan = int(value)
+        elif rowspan is None:
+            rowspan = int(value)
+    return 1 if colspan is None else colspan, 1 if rowspan is None else rowspan
+
+def table_events(tags: Iterable[Tuple[bytes, bytes]],
+                 all_tables: bool = False) -> Iterator[List[Tuple[int, int]]]:
+    """
+    Turn a tag stream into table rows, yielding None after each </table>.
+    
+    A row is yielded as soon as its </tr> is seen; rows without cells are
+    skipped and cells are only counted once closed, as the regexes do.
+    Unless all_tables is set, the stream stops after the first table.
+    """
+    in_table = in_row = False
+    cells = []
+    pending = None
+    for name, attributes in tags:
+        if not in_table:
+            in_table = name == b'table'
+        elif name == b'/table':
+            yield None
+            if not all_tables:
+                return
+            in_table = in_row = False
+            pending = None
+        elif name == b'tr':
+            if not in_row:
+                in_row = True
+                cells = []
+        elif name == b'/tr':
+            if in_row and cells:
+                yield cells
+            in_row = False
+            pending = None
+        elif name == b'td':
+            if in_row and pending is None:
+                pending = parse_spans(attributes)
+        elif name == b'/td':
+            if pending is not None:
+                cells.append(pending)
+                pending = None
+
+def rows_from_tags(tags: Iterable[Tuple[bytes, bytes]]) -> Iterator[List[Tuple[int, int]]]:
+    """Turn a tag stream into the rows of its first table, like parse_html."""
+    for cells in table_events(tags):
+        if cells is not None:
+            yield cells
+
+def tables_from_tags(tags: Iterable[Tuple[bytes, bytes]]) -> Iterator[List[List[Tuple[int, int]]]]:
+    """Turn a tag stream into the rows of every closed table, in document order."""
+    rows = []
+    for cells in table_events(tags, all_tables=True):
+        if cells is None:
+            yield rows
+            rows = []
+        else:
+            rows.append(cells)
+
+def iter_rows(stream: IO, chunk_size: int = CHUNK_SIZE) -> Iterator[List[Tuple[int, int]]]:
+    """
+    Streaming counterpart of parse_html.
+    
+    Args:
+        stream: Text or binary file object with HTML table markup
+        chunk_size: Number of bytes (or characters) read at a time
+        
+    Returns:
+        Iterator over rows of (colspan, rowspan) tuples, in document order
+    """
+    return rows_from_tags(iter_tags(read_chunks(stream, chunk_size)))
+
+def map_rows(path: str) -> Iterator[List[Tuple[int, int]]]:
+    """Rows of the first table of a file, read through mmap."""
+    return rows_from_tags(mapped_tags(path))
+
+def map_tables(path: str) -> Iterator[List[List[Tuple[int, int]]]]:
+    """Rows of every table of a file, read through mmap."""
+    return tables_from_tags(mapped_tags(path))
+
 def create_table(rows: List[List[Tuple[int, int]]]) -> List[str]:
     """Create table for complex case with merged cells."""
     # Build logical grid to handle rowspan and colspan
@@ -88,20 +260,161 @@ def create_table(rows: List[List[Tuple[int, int]]]) -> List[str]:
     num_rows = max_row + 1
     num_cols = max_col + 1
     
-    # Create empty ASCII grid
-    ascii_height = 2 * num_rows + 1
-    ascii_width = 2 * num_cols + 1
-    ascii_grid = [[' ' for _ in range(ascii_width)] for _ in range(ascii_height)]
-    
     # Draw cells and their borders
     processed_cells = set()
+    starts = []
     
     for (log_r, log_c), (cell_id, is_start, rowspan, colspan) in grid.items():
         if cell_id in processed_cells or not is_start:
             continue
         
         processed_cells.add(cell_id)
+        starts.append((log_r, log_c, colspan, rowspan))
+    
+    return draw_cells(starts, num_rows, num_cols)
+
+def place_cells(rows: Iterable[List[Tuple[int, int]]]) -> Iterator[Tuple[int, int, int, int]]:
+    """
+    Place cells on the logical grid with a column skyline.
+    
+    The skyline is a piecewise-constant map from column to the first row no
+    longer covered by an earlier rowspan, kept as sorted run starts (bounds)
+    and their levels. Finding the next free column skips whole runs and a
+    placement rewrites the runs it covers, so the cost depends on the number
+    of cells and runs, not on the area the spans cover.
+    
+    Args:
+        rows: Rows of (colspan, rowspan) tuples, as returned by parse_html
         
+    Returns:
+        Iterator over (row, col, colspan, rowspan) for every cell, row by row
+    """
+    bounds = [0]  # first column of each run
+    levels = [0]  # each run is occupied up to (not including) this row
+    
+    for row_idx, row in enumerate(rows):
+        col_idx = 0
+        run = 0
+        for colspan, rowspan in row:
+            # Find next available column
+            run = bisect_right(bounds, col_idx, run) - 1
+            while levels[run] > row_idx:
+                run += 1
+                col_idx = bounds[run]
+            
+            yield row_idx, col_idx, colspan, rowspan
+            
+            if colspan > 0 and rowspan > 0:
+                # Raise the skyline over [col_idx, col_idx + colspan); runs
+                # already covered for longer (overlapping spans) keep their level
+                end = col_idx + colspan
+                first = _split_run(bounds, levels, col_idx)
+                last = _split_run(bounds, levels, end)
+                level = row_idx + rowspan
+                new_bounds = []
+                new_levels = []
+                for k in range(first, last):
+                    run_level = max(levels[k], level)
+                    if not new_levels or new_levels[-1] != run_level:
+                        new_bounds.append(bounds[k])
+                        new_levels.append(run_level)
+                bounds[first:last] = new_bounds
+                levels[first:last] = new_levels
+                run = first
+            
+            col_idx += colspan
+
+def _split_run(bounds: List[int], levels: List[int], col: int) -> int:
+    """Make col the start of a run and return that run's index."""
+    run = bisect_right(bounds, col) - 1
+    if bounds[run] == col:
+        return run
+    bounds.insert(run + 1, col)
+    levels.insert(run + 1, levels[run])
+    return run + 1
+
+def layout_table(rows: Iterable[List[Tuple[int, int]]], charset: str = 'ascii') -> List[str]:
+    """Same output as create_table, placing cells with place_cells and drawing with edge masks."""
+    cells = [cell for cell in place_cells(rows) if cell[2] > 0 and cell[3] > 0]
+    if not cells:
+        return []
+    
+    num_rows = max(r + rowspan for r, c, colspan, rowspan in cells)
+    num_cols = max(c + colspan for r, c, colspan, rowspan in cells)
+    return render_masks(edge_masks(cells, num_rows, num_cols), charset)
+
+def edge_masks(cells: Iterable[Tuple[int, int, int, int]], num_rows: int, num_cols: int) -> List[bytearray]:
+    """
+    Build the edge bitmask of every border point in one pass over the cell perimeters.
+    
+    Point (r, c) is the corner between logical rows r - 1, r and columns
+    c - 1, c; its mask has UP/DOWN/LEFT/RIGHT set for each border leaving it.
+    Shared edges just set the same bits twice, nothing is overwritten.
+    """
+    masks = [bytearray(num_cols + 1) for _ in range(num_rows + 1)]
+    for row, col, colspan, rowspan in cells:
+        for points in (masks[row], masks[row + rowspan]):
+            for c in range(col, col + colspan):
+                points[c] |= RIGHT
+                points[c + 1] |= LEFT
+        for r in range(row, row + rowspan):
+            masks[r][col] |= DOWN
+            masks[r + 1][col] |= UP
+            masks[r][col + colspan] |= DOWN
+            masks[r + 1][col + colspan] |= UP
+    return masks
+
+def _translation_tables(charset: str) -> Tuple[dict, dict, dict]:
+    points, horizontal, vertical = CHARSETS[charset]
+    return (
+        {mask: points[mask] for mask in range(16)},
+        {mask: horizontal if mask & RIGHT else ' ' for mask in range(16)},
+        {mask: vertical if mask & DOWN else ' ' for mask in range(16)},
+    )
+
+_TABLES = {name: _translation_tables(name) for name in CHARSETS}
+
+def mask_lines(points: bytearray, charset: str = 'ascii') -> Tuple[str, str]:
+    """
+    Turn one row of point masks into its boundary line and the line below it.
+    
+    Characters come from lookup tables applied with str.translate, so the
+    ASCII and Unicode charsets cost the same.
+    """
+    point_table, horizontal_table, vertical_table = _TABLES[charset]
+    if not points:
+        return '', ''
+    text = points.decode('latin-1')
+    line = [' '] * (2 * len(text) - 1)
+    line[0::2] = text.translate(point_table)
+    line[1::2] = text[:-1].translate(horizontal_table)
+    boundary = ''.join(line).rstrip()
+    line[0::2] = text.translate(vertical_table)
+    line[1::2] = ' ' * (len(text) - 1)
+    inner = ''.join(line).rstrip()
+    return boundary, inner
+
+def render_masks(masks: List[bytearray], charset: str = 'ascii') -> List[str]:
+    """Draw a grid of point masks, trimmed like create_table output."""
+    result = []
+    for points in masks:
+        result.extend(mask_lines(points, charset))
+    
+    # Remove empty trailing lines
+    while result and not result[-1]:
+        result.pop()
+    
+    return result
+
+def draw_cells(cells: Iterable[Tuple[int, int, int, int]], num_rows: int, num_cols: int) -> List[str]:
+    """Draw the borders of placed (row, col, colspan, rowspan) cells."""
+    # Create empty ASCII grid
+    ascii_height = 2 * num_rows + 1
+    ascii_width = 2 * num_cols + 1
+    ascii_grid = [[' ' for _ in range(ascii_width)] for _ in range(ascii_height)]
+    
+    # Draw cells and their borders
+    for log_r, log_c, colspan, rowspan in cells:
         # Draw cell borders
         # Top border
         ascii_r = 2 * log_r
@@ -155,6 +468,290 @@ def create_table(rows: List[List[Tuple[int, int]]]) -> List[str]:
     
     return result
 
+def iter_lines(rows: Iterable[List[Tuple[int, int]]], charset: str = 'ascii') -> Iterator[bytes]:
+    """
+    Yield the lines of the drawn table one by one, as create_table would return them.
+    
+    Cells never draw above their first row, so both lines of logical row r
+    (its top boundary and its interior) are final once the cells starting at
+    r are placed. Only the cells still covering the current row are kept, and
+    each row of point masks is a bytearray, so memory depends on the table
+    width and the cells spanning into the current row, not on the table height.
+    """
+    cells = place_cells(rows)
+    next_cell = next(cells, None)
+    active = []
+    blank = 0
+    row_idx = 0
+    while next_cell is not None or active:
+        while next_cell is not None and next_cell[0] == row_idx:
+            if next_cell[2] > 0 and next_cell[3] > 0:
+                active.append(next_cell)
+            next_cell = next(cells, None)
+        
+        for line in mask_lines(_row_masks(active, row_idx), charset):
+            if not line:
+                # Blank lines are only emitted once something follows them
+                blank += 1
+                continue
+            for _ in range(blank):
+                yield b''
+            blank = 0
+            yield line.encode()
+        
+        active = [cell for cell in active if cell[0] + cell[3] > row_idx]
+        row_idx += 1
+
+def _row_masks(active: List[Tuple[int, int, int, int]], row_idx: int) -> bytearray:
+    """Point masks of boundary row_idx, the same row edge_masks would build."""
+    width = max((col + colspan + 1 for _, col, colspan, _ in active), default=0)
+    points = bytearray(width)
+    for row, col, colspan, rowspan in active:
+        right = col + colspan
+        if row == row_idx or row + rowspan == row_idx:
+            for c in range(col, right):
+                points[c] |= RIGHT
+                points[c + 1] |= LEFT
+        if row < row_idx:
+            points[col] |= UP
+            points[right] |= UP
+        if row + rowspan > row_idx:
+            points[col] |= DOWN
+            points[right] |= DOWN
+    return points
+
+def render_stream(rows: Iterable[List[Tuple[int, int]]], out: IO[bytes], charset: str = 'ascii') -> int:
+    """
+    Write the drawn table to a binary file object as lines become final.
+    
+    Args:
+        rows: Rows of (colspan, rowspan) tuples, e.g. from iter_rows
+        out: Binary file object to write to
+        charset: 'ascii' or 'unicode' (box-drawing characters, UTF-8 encoded)
+        
+    Returns:
+        Number of lines written
+    """
+    count = 0
+    for line in iter_lines(rows, charset):
+        if count:
+            out.write(b'\n')
+        out.write(line)
+        count += 1
+    return count
+
+class RenderCache:
+    """
+    Content-addressed cache of drawn tables in front of create_table.
+    
+    Tables are keyed by a SHA-256 of the canonical form of their span rows,
+    so every table with the same structure is drawn once. The in-memory tier
+    is an LRU bounded by the total size of the cached text; an optional
+    directory adds a tier shared between runs. hits, disk_hits and misses
+    count the lookups.
+    """
+    
+    def __init__(self, max_bytes: int = 64 << 20, cache_dir: str = None, render=create_table):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.render_rows = render
+        self.entries = OrderedDict()  # key -> drawn text, least recently used first
+        self.size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def key(rows: Iterable[Iterable[Tuple[int, int]]]) -> str:
+        canonical = ';'.join(' '.join(f'{colspan},{rowspan}' for colspan, rowspan in row) for row in rows)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + '.txt')
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached text for key, or None on a miss."""
+        text = self.entries.get(key)
+        if text is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return text
+        if self.cache_dir:
+            try:
+                with open(self._path(key)) as f:
+                    text = f.read()
+            except FileNotFoundError:
+                pass
+            else:
+                self.disk_hits += 1
+                self._remember(key, text)
+                return text
+        self.misses += 1
+        return None
+    
+    def put(self, key: str, text: str) -> None:
+        """Store the text drawn for key in both tiers."""
+        self._remember(key, text)
+        if self.cache_dir:
+            path = self._path(key)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Write aside and rename, so concurrent runs never read half a file
+                temp = f'{path}.{os.getpid()}.tmp'
+                with open(temp, 'w') as f:
+                    f.write(text)
+                os.replace(temp, path)
+    
+    def _remember(self, key: str, text: str) -> None:
+        if len(text) > self.max_bytes:
+            return
+        if key in self.entries:
+            self.size -= len(self.entries.pop(key))
+        self.entries[key] = text
+        self.size += len(text)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+    
+    def render(self, rows: List[List[Tuple[int, int]]]) -> List[str]:
+        """Cached create_table."""
+        key = self.key(rows)
+        text = self.get(key)
+        if text is None:
+            text = '\n'.join(self.render_rows(rows))
+            self.put(key, text)
+        return text.split('\n') if text else []
+    
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'entries': len(self.entries),
+            'bytes': self.size,
+        }
+
+def render_text(rows: List[List[Tuple[int, int]]]) -> str:
+    """Draw one table as text; the unit of work of the batch mode."""
+    return '\n'.join(layout_table(rows))
+
+def find_inputs(paths: Iterable[str]) -> List[str]:
+    """Expand directories into their HTML files, keeping the given order."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(os.listdir(path))
+            files.extend(os.path.join(path, name) for name in names
+                         if name.lower().endswith(('.html', '.htm')))
+        else:
+            files.append(path)
+    return files
+
+def _collect_tables(files: List[str], cache: Optional[RenderCache]) -> Tuple[list, dict, dict]:
+    """
+    Parse every table in this process and look each key up once.
+    
+    Returns the (file index, key) of every table in order, the text of the
+    keys already cached and the rows of every other key, once per key in
+    order of first appearance. The cache is only touched from this thread.
+    """
+    items = []
+    texts = {}
+    pending = {}
+    for file_idx, path in enumerate(files):
+        for rows in map_tables(path):
+            key = RenderCache.key(rows)
+            items.append((file_idx, key))
+            if key in texts or key in pending:
+                if cache is not None:
+                    cache.hits += 1  # Served from this run's own copy
+                continue
+            text = cache.get(key) if cache is not None else None
+            if text is None:
+                pending[key] = rows
+            else:
+                texts[key] = text
+    return items, texts, pending
+
+def _render_keyed(item: Tuple[str, List[List[Tuple[int, int]]]]) -> Tuple[str, str]:
+    key, rows = item
+    return key, render_text(rows)
+
+def convert_batch(paths: Iterable[str], out_dir: str = None, workers: int = None,
+                  cache: Optional[RenderCache] = None) -> Tuple[int, int]:
+    """
+    Convert every table of many HTML files using a pool of worker processes.
+    
+    Tables are parsed in this process from memory-mapped files, and only
+    tables whose structure is neither cached nor seen earlier in the run are
+    laid out by the workers, each structure once. Each file's tables go to
+    out_dir/<name>.txt (or to stdout), separated by blank lines.
+    
+    Args:
+        paths: HTML files, or directories whose .html/.htm files are converted
+        out_dir: Directory for the results; stdout if not given
+        workers: Number of worker processes; os.cpu_count() if not given
+        cache: Cache consulted before a table is sent to the workers
+        
+    Returns:
+        (number of files, number of tables) converted
+    """
+    files = find_inputs(paths)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    
+    out = sys.stdout
+    current = -1
+    first = True
+    tables = 0
+    
+    def advance(file_idx):
+        # Files without tables still get an (empty) output file
+        nonlocal out, current, first
+        while current < file_idx:
+            current += 1
+            if out_dir:
+                if out is not sys.stdout:
+                    out.close()
+                name = os.path.splitext(os.path.basename(files[current]))[0] + '.txt'
+                out = open(os.path.join(out_dir, name), 'w')
+                first = True
+    
+    items, texts, pending = _collect_tables(files, cache)
+    uses = Counter(key for _, key in items)
+    
+    with multiprocessing.Pool(workers) as pool:
+        # Results come in order of first appearance, so a key missing from
+        # texts is always the next one drawn
+        drawn = pool.imap(_render_keyed, list(pending.items()), chunksize=16)
+        for file_idx, key in items:
+            text = texts.get(key)
+            if text is None:
+                _, text = next(drawn)
+                texts[key] = text
+                if cache is not None:
+                    cache.put(key, text)
+            uses[key] -= 1
+            if not uses[key]:
+                del texts[key]
+            advance(file_idx)
+            if not first:
+                out.write('\n\n')
+            out.write(text)
+            first = False
+            tables += 1
+    
+    advance(len(files) - 1)
+    if out is sys.stdout:
+        if not first:
+            out.write('\n')
+    else:
+        out.close()
+    
+    return len(files), tables
+
 def draw_table(html: str) -> str:
     """
     Convert HTML table to ASCII art representation.
@@ -168,13 +765,213 @@ def draw_table(html: str) -> str:
     # Parse HTML table
     rows = parse_html(html)
     
-    # Create ASCII structure
-    table = create_table(rows)
+    # Create ASCII structure; create_table stays as the reference drawing
+    table = layout_table(rows)
     
     # Join rows with newlines
     return '\n'.join(table)
 
+def run_tests():
+    import io
+    import random
+    import tempfile
+    from benchmark import generate_rows
+    
+    rng = random.Random(2025)
+    
+    def random_rows(num_rows, num_cols, max_span, span_prob):
+        return generate_rows(rng, num_rows, num_cols, max_span, max_span, span_prob)
+    
+    def random_html(rows):
+        # Random case, whitespace and cell text, including bare '<' characters
+        def gap():
+            return rng.choice(['', ' ', '\n  ', '\t'])
+        
+        def tag(name):
+            return name.upper() if rng.random() < 0.2 else name
+        
+        parts = [f'<{tag("table")}>{gap()}']
+        for row in rows:
+            parts.append(f'<{tag("tr")}>{gap()}')
+            for colspan, rowspan in row:
+                attributes = ''
+                if colspan > 1:
+                    attributes += f' colspan{gap()}={gap()}"{colspan}"'
+                if rowspan > 1:
+                    attributes += f" rowspan='{rowspan}'"
+                text = rng.choice(['x', 'a < b', '1 <2', '<', ''])
+                parts.append(f'<{tag("td")}{attributes}>{text}</{tag("td")}>{gap()}')
+            parts.append(f'</{tag("tr")}>{gap()}')
+        parts.append(f'</{tag("table")}>')
+        return ''.join(parts)
+    
+    # The streaming tokenizer must agree with parse_html, whatever the chunk size
+    failures = 0
+    for _ in range(200):
+        html = random_html(random_rows(rng.randint(1, 8), rng.randint(1, 8), 4, 0.4))
+        expected = parse_html(html)
+        for chunk_size in (1, 2, 3, 7, CHUNK_SIZE):
+            if list(iter_rows(io.StringIO(html), chunk_size)) != expected:
+                failures += 1
+                print(f"✗ iter_rows (chunk size {chunk_size}) differs on: {html}")
+                break
+    print(f"{'✓' if failures == 0 else '✗'} iter_rows against parse_html\n")
+    
+    # Skyline placement with edge-mask drawing must match the dict grid
+    tilings = [random_rows(rng.randint(1, 12), rng.randint(1, 12), 5, 0.5) for _ in range(200)]
+    failures = 0
+    for rows in tilings:
+        if layout_table(rows) != create_table(rows):
+            failures += 1
+            print(f"✗ layout_table differs on: {rows}")
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input.txt')) as f:
+        rows = parse_html(f.read())
+    if layout_table(rows) != create_table(rows):
+        failures += 1
+        print("✗ layout_table differs on input.txt")
+    print(f"{'✓' if failures == 0 else '✗'} layout_table against create_table\n")
+    
+    # The streaming renderer must write the same text. Cutting rows short
+    # leaves gaps and can make spans overlap, where only the mask drawing
+    # of layout_table is the reference
+    failures = 0
+    for rows in tilings:
+        ragged = [row[:rng.randint(1, len(row))] for row in rows]
+        for case, reference in ((rows, create_table), (ragged, layout_table)):
+            out = io.BytesIO()
+            render_stream(iter(case), out)
+            if out.getvalue().decode() != '\n'.join(reference(case)):
+                failures += 1
+                print(f"✗ render_stream differs on: {case}")
+    print(f"{'✓' if failures == 0 else '✗'} render_stream against create_table\n")
+    
+    # Box-drawing output must be the ASCII drawing with other characters,
+    # from layout_table and render_stream alike
+    to_ascii = str.maketrans(CHARSETS['unicode'][0][1:] + '─│', CHARSETS['ascii'][0][1:] + '-|')
+    failures = 0
+    for rows in tilings:
+        lines = layout_table(rows, 'unicode')
+        out = io.BytesIO()
+        render_stream(iter(rows), out, 'unicode')
+        if [line.translate(to_ascii) for line in lines] != layout_table(rows):
+            failures += 1
+            print(f"✗ unicode layout_table differs on: {rows}")
+        if out.getvalue().decode() != '\n'.join(lines):
+            failures += 1
+            print(f"✗ unicode render_stream differs on: {rows}")
+    print(f"{'✓' if failures == 0 else '✗'} unicode charset against ascii\n")
+    
+    # Memory-mapped files must parse like the text, one table or many
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tables.html')
+        for _ in range(50):
+            tables = [random_rows(rng.randint(1, 6), rng.randint(1, 6), 3, 0.4) for _ in range(rng.randint(1, 4))]
+            documents = [random_html(rows) for rows in tables]
+            with open(path, 'w') as f:
+                f.write('\n<p>text < more</p>\n'.join(documents))
+            if list(map_rows(path)) != parse_html(documents[0]):
+                failures += 1
+                print(f"✗ map_rows differs on: {documents[0]}")
+            if list(map_tables(path)) != [parse_html(document) for document in documents]:
+                failures += 1
+                print(f"✗ map_tables differs on: {documents}")
+    print(f"{'✓' if failures == 0 else '✗'} map_rows and map_tables against parse_html\n")
+    
+    # The render cache: hits and misses, LRU eviction by size, the disk tier
+    failures = 0
+    rows = tilings[0]
+    text = '\n'.join(create_table(rows))
+    with tempfile.TemporaryDirectory() as directory:
+        cache = RenderCache(cache_dir=directory)
+        if cache.render(rows) != create_table(rows) or cache.render(rows) != create_table(rows):
+            failures += 1
+            print("✗ RenderCache.render differs from create_table")
+        if (cache.hits, cache.misses) != (1, 1):
+            failures += 1
+            print(f"✗ RenderCache counted {cache.stats()} for one miss and one hit")
+        shared = RenderCache(cache_dir=directory)
+        if shared.get(cache.key(rows)) != text or shared.disk_hits != 1:
+            failures += 1
+            print("✗ RenderCache disk tier not shared")
+    cache = RenderCache(max_bytes=10)
+    for key in ('a', 'b', 'a', 'c'):
+        if cache.get(key) is None:
+            cache.put(key, key * 4)
+    if list(cache.entries) != ['a', 'c'] or cache.size != 8 or cache.misses != 3:
+        failures += 1
+        print(f"✗ RenderCache evicted wrongly: {list(cache.entries)}, {cache.stats()}")
+    print(f"{'✓' if failures == 0 else '✗'} RenderCache hits, misses, eviction and disk tier\n")
+    
+    # Batch mode draws every structure once and writes every table in order
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        tables = [tilings[0]] * 30 + tilings[1:4] + [tilings[0]] * 30
+        paths = []
+        for k in range(0, len(tables), 16):
+            paths.append(os.path.join(directory, f'{k:03}.html'))
+            with open(paths[-1], 'w') as f:
+                f.write('\n'.join(random_html(rows) for rows in tables[k:k + 16]))
+        out_dir = os.path.join(directory, 'out')
+        cache = RenderCache()
+        if convert_batch(paths, out_dir, 2, cache) != (len(paths), len(tables)):
+            failures += 1
+        if (cache.misses, cache.hits) != (4, len(tables) - 4):
+            failures += 1
+            print(f"✗ convert_batch cache counters: {cache.stats()}")
+        for k, path in enumerate(paths):
+            with open(os.path.join(out_dir, os.path.basename(path)[:-5] + '.txt')) as f:
+                expected = '\n\n'.join('\n'.join(create_table(rows)) for rows in tables[16 * k:16 * k + 16])
+                if f.read() != expected:
+                    failures += 1
+                    print(f"✗ convert_batch output differs for {os.path.basename(path)}")
+    print(f"{'✓' if failures == 0 else '✗'} convert_batch with duplicate tables\n")
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Draw HTML tables as ASCII art")
+    parser.add_argument("--stream", action="store_true",
+                        help="read stdin in chunks and write lines as soon as they are final")
+    parser.add_argument("--unicode", action="store_true",
+                        help="draw borders with box-drawing characters (--stream and --mmap)")
+    parser.add_argument("--mmap", metavar="PATH",
+                        help="memory-map PATH, scan its bytes in place and stream the table to stdout")
+    parser.add_argument("--batch", nargs="+", metavar="PATH",
+                        help="convert every table of these HTML files or directories")
+    parser.add_argument("--out", metavar="DIR", help="output directory for --batch (default: stdout)")
+    parser.add_argument("--workers", type=int, help="worker processes for --batch (default: CPU count)")
+    parser.add_argument("--cache-dir", metavar="DIR", help="on-disk render cache shared between --batch runs")
+    parser.add_argument("--cache-mb", type=int, default=64, help="in-memory render cache budget for --batch, MB")
+    parser.add_argument("--test", action="store_true", help="run the self-tests")
+    args = parser.parse_args()
+    
+    if args.test:
+        run_tests()
+        sys.exit(0)
+    
+    if args.batch:
+        # Пакетный режим: все таблицы всех файлов, вёрстка в пуле процессов
+        start_time = time.time()
+        cache = RenderCache(args.cache_mb << 20, args.cache_dir)
+        files, tables = convert_batch(args.batch, args.out, args.workers, cache)
+        elapsed = time.time() - start_time
+        rate = tables / elapsed if elapsed > 0 else float('inf')
+        print(f"{tables} tables from {files} files in {elapsed:.3f} s ({rate:.1f} tables/s)", file=sys.stderr)
+        stats = cache.stats()
+        print(f"cache: {stats['hits']} hits, {stats['disk_hits']} disk hits, {stats['misses']} misses", file=sys.stderr)
+        sys.exit(0)
+    
+    if args.mmap:
+        # Файл отображается в память и разбирается без декодирования
+        render_stream(map_rows(args.mmap), sys.stdout.buffer, 'unicode' if args.unicode else 'ascii')
+        sys.stdout.buffer.write(b'\n')
+        sys.exit(0)
+    
+    if args.stream:
+        # Потоковый режим: читаем stdin по частям и пишем строки по мере готовности
+        render_stream(iter_rows(sys.stdin.buffer), sys.stdout.buffer, 'unicode' if args.unicode else 'ascii')
+        sys.stdout.buffer.write(b'\n')
+        sys.exit(0)
+    
     # Пытаемся прочитать из input.txt, если не получится - читаем из стандартного ввода
     try:
         with open('input.txt', 'r') as f:
@@ -0,0 +1,243 @@
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+import solution
+from solution import (EXACT_DATASET_THRESHOLD, HUGE_DATASET_THRESHOLD, csr_to_sets, local_search,
+                      read_input, run_portfolio, solve, solve_exact, solve_greedy_with_order,
+                      solve_heap_greedy, solve_with_multiple_starts, strategy_order)
+
+# name, transactions, cells, max reads, max writes, set size distribution, hot cell probability
+CASES = [
+    ("tiny", 40, 120, 3, 3, "uniform", 0.0),
+    ("exact", 100, 400, 4, 3, "uniform", 0.1),
+    ("sparse", 2000, 4000, 4, 2, "uniform", 0.0),
+    ("dense", 1000, 800, 8, 4, "skewed", 0.3),
+    ("large", 10000, 12000, 5, 3, "skewed", 0.1),
+    ("huge", 100000, 150000, 4, 2, "uniform", 0.05),
+]
+
+def generate_transactions(rng: random.Random, n: int, m: int, max_reads: int, max_writes: int,
+                          sizes: str, hot: float) -> List[Tuple[List[int], List[int]]]:
+    """
+    Generate n random (reads, writes) cell lists over cells 1..m.
+
+    Set sizes are uniform in 1..max or, when skewed, heavy-tailed and capped
+    at max. Each cell is drawn from the hottest 1% of cells with probability
+    hot, which raises the conflict density.
+    """
+    hot_cells = max(1, m // 100)
+
+    def size(limit: int) -> int:
+        if sizes == "skewed":
+            return min(limit, int(rng.paretovariate(1.5)))
+        return rng.randint(1, limit)
+
+    def draw(count: int) -> List[int]:
+        chosen = set()
+        while len(chosen) < count:
+            if rng.random() < hot:
+                chosen.add(rng.randint(1, hot_cells))
+            else:
+                chosen.add(rng.randint(1, m))
+        return sorted(chosen)
+
+    return [(draw(size(max_reads)), draw(size(max_writes))) for _ in range(n)]
+
+def to_text(m: int, transactions: List[Tuple[List[int], List[int]]]) -> str:
+    """Render transactions in the solution's input format."""
+    lines = [f"{len(transactions)} {m}"]
+    for reads, writes in transactions:
+        lines.append(f"{len(reads)} {len(writes)}")
+        lines.append(" ".join(map(str, reads)))
+        lines.append(" ".join(map(str, writes)))
+    return "\n".join(lines) + "\n"
+
+def parse(text: str):
+    """Parse input text with the solution's own reader."""
+    original_stdin = sys.stdin
+    sys.stdin = io.StringIO(text)
+    try:
+        return read_input()
+    finally:
+        sys.stdin = original_stdin
+
+def check_order(offsets, cells, order: List[int]) -> None:
+    """Check in linear time that order is a valid answer for the CSR arrays; raise ValueError if not."""
+    n = (len(offsets) - 1) // 2
+    used = bytearray(n + 1)
+    corrupted = bytearray(max(cells, default=0) + 1)
+    for k in order:
+        if not 1 <= k <= n:
+            raise ValueError(f"transaction {k} out of range")
+        if used[k]:
+            raise ValueError(f"transaction {k} repeated")
+        used[k] = 1
+        i = k - 1
+        for cell in cells[offsets[2 * i]:offsets[2 * i + 1]]:
+            if corrupted[cell]:
+                raise ValueError(f"transaction {k} reads corrupted cell {cell}")
+        for cell in cells[offsets[2 * i + 1]:offsets[2 * i + 2]]:
+            corrupted[cell] = 1
+
+def run_solve(text: str, workers: int) -> Tuple[List[int], dict]:
+    """Run the whole solve() on text; return its order and its telemetry."""
+    handle, path = tempfile.mkstemp(suffix=".json")
+    os.close(handle)
+    original_stdin, original_stdout = sys.stdin, sys.stdout
+    solution.TELEMETRY_TARGET = path
+    try:
+        sys.stdin = io.StringIO(text)
+        sys.stdout = io.StringIO()
+        solve(workers)
+        lines = sys.stdout.getvalue().split("\n")
+    finally:
+        sys.stdin, sys.stdout = original_stdin, original_stdout
+        solution.TELEMETRY_TARGET = None
+    with open(path) as f:
+        telemetry = json.load(f)
+    os.remove(path)
+    count = int(lines[0])
+    return list(map(int, lines[1].split())) if count else [], telemetry
+
+def solvers(text: str, offsets, cells, workers: int) -> Dict[str, Callable[[float], Tuple[List[int], dict]]]:
+    """
+    Every solver that applies to the instance, each run until a deadline.
+
+    The heap greedy modes and the exact solver only run where solve() would
+    use them; exact reports whether it proved its answer optimal.
+    """
+    n = (len(offsets) - 1) // 2
+    transactions = csr_to_sets(offsets, cells)
+    def whole(deadline):
+        result, telemetry = run_solve(text, workers)
+        return result, {"telemetry": telemetry}
+    runs = {"solve": whole}
+    if n <= HUGE_DATASET_THRESHOLD:
+        for mode in ("complex", "simple", "ultra_fast"):
+            runs[f"greedy:{mode}"] = (lambda deadline, mode=mode: (
+                solve_heap_greedy(transactions, deadline, mode), {}))
+    runs["multi_start"] = lambda deadline: (solve_with_multiple_starts(offsets, cells, deadline), {})
+    for strategy in ("shuffle", "write_size", "ratio"):
+        runs[f"order:{strategy}"] = (lambda deadline, strategy=strategy: (
+            solve_greedy_with_order(transactions, strategy_order(transactions, strategy), deadline), {}))
+    runs["local_search"] = lambda deadline: (local_search(
+        transactions, solve_greedy_with_order(transactions, strategy_order(transactions, "ratio"), deadline),
+        deadline), {})
+    if workers > 1:
+        runs["portfolio"] = lambda deadline: (run_portfolio(
+            offsets, cells, solve_with_multiple_starts(offsets, cells, deadline), deadline, workers), {})
+    if n <= EXACT_DATASET_THRESHOLD:
+        def exact(deadline):
+            result, proven = solve_exact(transactions, [], deadline)
+            return result, {"proven": proven}
+        runs["exact"] = exact
+    return runs
+
+def run_case(name: str, n: int, m: int, max_reads: int, max_writes: int, sizes: str, hot: float,
+             seed: int, budgets: List[float], workers: int, best_known: int) -> dict:
+    rng = random.Random(seed)
+    text = to_text(m, generate_transactions(rng, n, m, max_reads, max_writes, sizes, hot))
+    _, _, offsets, cells = parse(text)
+
+    runs = {}
+    optimum = None
+    original_budget = solution.MAX_EXECUTION_TIME
+    try:
+        for budget in budgets:
+            solution.MAX_EXECUTION_TIME = budget
+            for solver, run in solvers(text, offsets, cells, workers).items():
+                random.seed(seed)
+                start = time.time()
+                order, details = run(start + budget)
+                seconds = time.time() - start
+                check_order(offsets, cells, order)
+                if details.get("proven"):
+                    optimum = len(order)
+                runs[f"{solver}@{budget:g}"] = {
+                    "solver": solver, "budget": budget, "seconds": seconds, "size": len(order),
+                    "transactions_per_second": n / seconds if seconds else float('inf'), **details,
+                }
+    finally:
+        solution.MAX_EXECUTION_TIME = original_budget
+
+    # Gaps are taken to a proven optimum, else to the best size ever seen
+    bound = optimum if optimum is not None else max([best_known] + [run["size"] for run in runs.values()])
+    for run in runs.values():
+        run["gap"] = (bound - run["size"]) / bound if bound else 0.0
+    return {
+        "params": {
+            "n": n, "m": m, "max_reads": max_reads, "max_writes": max_writes,
+            "sizes": sizes, "hot": hot, "seed": seed,
+        },
+        "bound": bound,
+        "bound_kind": "exact" if optimum is not None else "best_known",
+        "runs": runs,
+    }
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Return a description of every run whose size fell below baseline by more than tolerance."""
+    regressions = []
+    for name, case in results["cases"].items():
+        base_case = baseline.get("cases", {}).get(name)
+        if base_case is None:
+            continue
+        for key, run in case["runs"].items():
+            base = base_case["runs"].get(key)
+            if base is None:
+                continue
+            if run["size"] < base["size"] * (1 - tolerance):
+                regressions.append(f"{name}/{key} size: {base['size']} -> {run['size']}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark result quality against time for the G solvers")
+    parser.add_argument("--case", action="append", help="run only these cases (default: all)")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--budget", type=float, action="append",
+                        help="time budget in seconds, may repeat (default: 1)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes for solve() and the portfolio")
+    parser.add_argument("--output", metavar="FILE", help="write the JSON results here (default: stdout)")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="JSON results to compare against; their sizes also count as best known")
+    parser.add_argument("--tolerance", type=float, default=0.01,
+                        help="allowed result size loss against the baseline, as a fraction")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {"python": sys.version.split()[0], "cases": {}}
+    for case in CASES:
+        name = case[0]
+        if args.case and name not in args.case:
+            continue
+        best_known = baseline.get("cases", {}).get(name, {}).get("bound", 0)
+        results["cases"][name] = run_case(*case, seed=args.seed, budgets=args.budget or [1.0],
+                                          workers=args.workers, best_known=best_known)
+        runs = results["cases"][name]["runs"]
+        summary = ", ".join(f"{key} {run['size']} ({run['gap'] * 100:.1f}%)" for key, run in runs.items())
+        print(f"{name}: {summary}", file=sys.stderr)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"✗ {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("✓ No regressions against the baseline", file=sys.stderr)
@@ -1,64 +1,310 @@
 import time
 import sys
+import os
+import json
 from io import StringIO
 from collections import defaultdict
+from array import array
+import heapq
 import random
+import multiprocessing
+from multiprocessing import shared_memory
 
-# Time limits in seconds
-SWITCH_TO_SIMPLE_TIME = 2.5  # Switch to simple algorithm after this time
-SWITCH_TO_ULTRA_FAST_TIME = 3.2  # Switch to ultra-fast algorithm after this time
-MAX_EXECUTION_TIME = 3.9     # Maximum execution time before stopping
+# Time limits in seconds; --budget or G_TIME_BUDGET override the total.
+# Everything else is a share of the time, so it scales with the budget.
+MAX_EXECUTION_TIME = float(os.environ.get("G_TIME_BUDGET", 3.9))  # Maximum execution time before stopping
+SAFETY_SHARE = 0.05      # Share of the budget held back for starting up and clock slack
+FINISH_COST = 3e-6       # Seconds per transaction held back to free, print and exit
+GREEDY_SHARE = 0.6       # Share of the time left the greedy may plan to use
+EXACT_SHARE = 0.8        # Share of the time left the exact solver may use
+DECOMPOSE_SHARE = 0.6    # Share of the time left the conflict decomposition may use
+LOCAL_SEARCH_SHARE = 0.25  # Share of the time left kept for local search after greedy passes
+VICTIM_VISIT_COST = 3e-7   # Seconds per reader visited by the victim precompute
+SETS_ENTRY_COST = 1e-6     # Seconds per read or write for csr_to_sets
+LOCAL_SEARCH_ENTRY_COST = 2.5e-6  # Seconds per read or write to index and seed local search
+DECOMPOSE_ENTRY_COST = 2e-6  # Seconds per read or write for conflict_components
+CLOCK_INTERVAL = 0.001   # Aim for one clock read per this many seconds in hot loops
 
 # Performance thresholds
-MEDIUM_DATASET_THRESHOLD = 400  # Use complex algorithm if n <= this
 LARGE_DATASET_THRESHOLD = 1000  # Consider dataset large if n > this
 HUGE_DATASET_THRESHOLD = 5000   # Consider dataset huge if n > this
+EXACT_DATASET_THRESHOLD = 100   # Try the exact solver if n <= this
 
-def read_transaction():
-    """Read a single transaction's data from input."""
-    r_i, w_i = map(int, input().split())
-    read_set = list(map(int, input().split()))
-    write_set = list(map(int, input().split()))
-    return read_set, write_set
+# Start strategies of the portfolio workers, handed out round robin
+PORTFOLIO_STRATEGIES = ("incumbent", "shuffle", "write_size", "ratio")
 
-def solve_with_multiple_starts(transactions, start_time, max_attempts=2):
-    """Try multiple starting strategies and return the best result."""
+# Where solve() writes its telemetry JSON ("-" for stderr); --telemetry or
+# G_TELEMETRY set it, and without it no telemetry is recorded
+TELEMETRY_TARGET = os.environ.get("G_TELEMETRY")
+TELEMETRY = None  # The Telemetry of the running solve(), if any
+
+class Deadline:
+    """A point in time that hot loops can check cheaply.
+    
+    The clock is read only once per batch of passed() calls, and the batch
+    is resized so that reads happen about every CLOCK_INTERVAL seconds,
+    whatever one call of the loop costs.
+    """
+    
+    def __init__(self, at):
+        self.at = at
+        self.batch = 1
+        self.calls = 0
+        self.last = time.time()
+    
+    def passed(self):
+        self.calls += 1
+        if self.calls < self.batch:
+            return False
+        now = time.time()
+        if now - self.last < CLOCK_INTERVAL / 2 and self.batch < 1024:
+            self.batch *= 2
+        elif now - self.last > CLOCK_INTERVAL * 2 and self.batch > 1:
+            self.batch //= 2
+        self.calls = 0
+        self.last = now
+        return now > self.at
+
+class Telemetry:
+    """Record of one solve() run, written out as JSON when it ends.
+    
+    Keeps the seconds spent per phase, the greedy candidates scored per
+    mode, the mode switches and the (time, best length) curve; times count
+    from the start of the run. Hooks check TELEMETRY is not None first and
+    sit outside the inner loops, so a run without telemetry pays nothing
+    more than those checks.
+    """
+    
+    def __init__(self, target):
+        self.target = target
+        self.start = time.time()
+        self.phases = defaultdict(float)
+        self.scored = defaultdict(int)
+        self.switches = []
+        self.curve = []
+        self.accepted = 0  # Transactions on no conflict cycle
+        self.bests = {}    # Best length per cyclic component
+        self.component = None
+    
+    def elapsed(self):
+        return round(time.time() - self.start, 6)
+    
+    def phase(self, name, since):
+        """Add the time since `since` to a phase and return the current time."""
+        now = time.time()
+        self.phases[name] += now - since
+        return now
+    
+    def switch(self, mode):
+        self.switches.append({"time": self.elapsed(), "component": self.component, "mode": mode})
+    
+    def best(self, length):
+        """Note a result of the current component; improvements extend the curve."""
+        if length > self.bests.get(self.component, 0):
+            self.bests[self.component] = length
+            self.curve.append([self.elapsed(), self.accepted + sum(self.bests.values())])
+    
+    def write(self):
+        report = {
+            "seconds": self.elapsed(),
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "scored": dict(self.scored),
+            "switches": self.switches,
+            "curve": self.curve,
+        }
+        text = json.dumps(report)
+        if self.target == "-":
+            print(text, file=sys.stderr, flush=True)
+        else:
+            with open(self.target, "w") as f:
+                f.write(text + "\n")
+
+def read_input():
+    """Read the whole input at once into flat arrays (CSR layout).
+    
+    Returns n, m, offsets and cells: transaction i reads
+    cells[offsets[2i]:offsets[2i + 1]] and writes
+    cells[offsets[2i + 1]:offsets[2i + 2]].
+    """
+    stream = getattr(sys.stdin, "buffer", sys.stdin)
+    values = array('i', map(int, stream.read().split()))
+    n, m = values[0], values[1]
+    
+    offsets = array('i', [0])
+    cells = array('i')
+    position = 2
+    end = 0
+    for _ in range(n):
+        read_count = values[position]
+        write_count = values[position + 1]
+        position += 2
+        cells.extend(values[position:position + read_count + write_count])
+        position += read_count + write_count
+        end += read_count
+        offsets.append(end)
+        end += write_count
+        offsets.append(end)
+    return n, m, offsets, cells
+
+def csr_to_sets(offsets, cells):
+    """Materialise (read_set, write_set) pairs from the CSR arrays."""
+    return [(set(cells[offsets[k]:offsets[k + 1]]), set(cells[offsets[k + 1]:offsets[k + 2]]))
+            for k in range(0, len(offsets) - 1, 2)]
+
+def csr_subset(offsets, cells, members):
+    """CSR arrays of just the given transactions, in the given order."""
+    sub_offsets = array('i', [0])
+    sub_cells = array('i')
+    for i in members:
+        sub_cells.extend(cells[offsets[2 * i]:offsets[2 * i + 2]])
+        sub_offsets.append(sub_offsets[-1] + offsets[2 * i + 1] - offsets[2 * i])
+        sub_offsets.append(len(sub_cells))
+    return sub_offsets, sub_cells
+
+def conflict_components(n, offsets, cells, deadline=None):
+    """Split the transactions into strongly connected conflict components.
+    
+    The graph runs from each transaction to the cells it writes and from
+    each cell to the transactions that read it, so it stays linear in the
+    input; a transaction reading a cell it writes itself closes no cycle
+    with the others. Components (sorted lists of transaction indices) come
+    out sinks first, which is an executable order: readers of a cell before
+    its writers. Iterative Tarjan; returns None once deadline has passed.
+    """
+    size = max(cells, default=0) + 1
+    readers = [[] for _ in range(size)]
+    for i in range(n):
+        for cell in cells[offsets[2 * i]:offsets[2 * i + 1]]:
+            readers[cell].append(i)
+    
+    def successors(v):
+        if v < n:
+            return [n + cell for cell in cells[offsets[2 * v + 1]:offsets[2 * v + 2]]]
+        return readers[v - n]
+    
+    index = [-1] * (n + size)
+    low = [0] * (n + size)
+    on_stack = bytearray(n + size)
+    stack = []
+    components = []
+    counter = 0
+    clock = Deadline(deadline) if deadline is not None else None
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, iter(successors(root)))]
+        while work:
+            if clock is not None and clock.passed():
+                return None
+            v, edges = work[-1]
+            for w in edges:
+                if index[w] < 0:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    work.append((w, iter(successors(w))))
+                    break
+                if on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        if w < n:
+                            component.append(w)
+                        if w == v:
+                            break
+                    if component:
+                        component.sort()
+                        components.append(component)
+    return components
+
+def solve_greedy_csr(offsets, cells, order, deadline):
+    """solve_greedy_with_order on the CSR arrays, with a flag per cell."""
+    result = []
+    corrupted = bytearray(max(cells, default=0) + 1)
+    is_corrupted = corrupted.__getitem__
+    clock = Deadline(deadline)
+    
+    for i in order:
+        if clock.passed():
+            break
+        
+        read_start = offsets[2 * i]
+        write_start = offsets[2 * i + 1]
+        
+        # Check if this transaction can be executed
+        if any(map(is_corrupted, cells[read_start:write_start])):
+            continue
+        
+        # Add the transaction and mark its writes
+        result.append(i + 1)
+        for cell in cells[write_start:offsets[2 * i + 2]]:
+            corrupted[cell] = 1
+    
+    return result
+
+def solve_with_multiple_starts(offsets, cells, deadline, reserve=0.0, max_attempts=3):
+    """Try multiple starting strategies on the CSR arrays and return the best result.
+    
+    Attempts after the first start only while more than reserve seconds
+    are left before deadline.
+    """
     best_result = []
-    n = len(transactions)
+    n = (len(offsets) - 1) // 2
+    read_sizes = [offsets[2 * i + 1] - offsets[2 * i] for i in range(n)]
+    write_sizes = [offsets[2 * i + 2] - offsets[2 * i + 1] for i in range(n)]
     
     for attempt in range(max_attempts):
-        if time.time() - start_time > MAX_EXECUTION_TIME - 1.0:
+        # The first attempt always runs, so even a short budget gets a result
+        if attempt and deadline - time.time() <= reserve:
             break
             
         # Different starting strategies
         if attempt == 0:
             # Strategy 1: Sort by simple read/write ratio
-            ratios = [(len(transactions[i][0]) / max(len(transactions[i][1]), 1), i) 
-                     for i in range(n)]
+            ratios = [(read_sizes[i] / max(write_sizes[i], 1), i) for i in range(n)]
             ratios.sort(reverse=True)
             order = [i for _, i in ratios]
-        else:
+        elif attempt == 1:
             # Strategy 2: Sort by write set size (ascending)
-            write_sizes = [(len(transactions[i][1]), i) for i in range(n)]
-            write_sizes.sort()
-            order = [i for _, i in write_sizes]
+            order = sorted(range(n), key=write_sizes.__getitem__)
+        else:
+            # Strategy 3: Sort by total size (read + write, ascending)
+            order = sorted(range(n), key=lambda i: read_sizes[i] + write_sizes[i])
         
         # Try greedy with this order
-        result = solve_greedy_with_order(transactions, order, start_time)
+        result = solve_greedy_csr(offsets, cells, order, deadline)
+        if TELEMETRY is not None:
+            TELEMETRY.scored["multi_start"] += len(order)
+            TELEMETRY.best(len(result))
         
         if len(result) > len(best_result):
             best_result = result
     
     return best_result
 
-def solve_greedy_with_order(transactions, order, start_time):
+def solve_greedy_with_order(transactions, order, deadline):
     """Solve greedily following the given order of transaction preferences."""
     result = []
     used = set()
     corrupted_cells = set()
+    clock = Deadline(deadline)
     
     for i in order:
-        if time.time() - start_time > MAX_EXECUTION_TIME:
+        if clock.passed():
             break
             
         if i in used:
@@ -79,7 +325,7 @@ def solve_greedy_with_order(transactions, order, start_time):
     
     return result
 
-def try_additional_improvements(transactions, initial_result, start_time):
+def try_additional_improvements(transactions, initial_result, deadline):
     """Try additional optimization strategies if time permits."""
     best_result = initial_result[:]
     n = len(transactions)
@@ -87,45 +333,45 @@ def try_additional_improvements(transactions, initial_result, start_time):
     # Determine strategies based on dataset size
     if n <= LARGE_DATASET_THRESHOLD:
         # For small/medium datasets: more comprehensive search
-        max_random_attempts = min(10, max(1, int((MAX_EXECUTION_TIME - (time.time() - start_time)) * 5)))
+        max_random_attempts = min(10, max(1, int((deadline - time.time()) * 5)))
         
         # Strategy 1: Try different random orders
         attempts = 0
-        while attempts < max_random_attempts and time.time() - start_time < MAX_EXECUTION_TIME - 0.3:
+        while attempts < max_random_attempts and time.time() < deadline:
             order = list(range(n))
             random.shuffle(order)
             
-            result = solve_greedy_with_order(transactions, order, start_time)
+            result = solve_greedy_with_order(transactions, order, deadline)
             if len(result) > len(best_result):
                 best_result = result
             
             attempts += 1
         
         # Strategy 2: Try reverse order
-        if time.time() - start_time < MAX_EXECUTION_TIME - 0.2:
+        if time.time() < deadline:
             reverse_order = list(range(n))
             reverse_order.reverse()
             
-            result = solve_greedy_with_order(transactions, reverse_order, start_time)
+            result = solve_greedy_with_order(transactions, reverse_order, deadline)
             if len(result) > len(best_result):
                 best_result = result
         
         # Strategy 3: Try sorting by read set size
-        if time.time() - start_time < MAX_EXECUTION_TIME - 0.1:
+        if time.time() < deadline:
             read_sizes = [(len(transactions[i][0]), i) for i in range(n)]
             read_sizes.sort(reverse=True)
             order = [i for _, i in read_sizes]
             
-            result = solve_greedy_with_order(transactions, order, start_time)
+            result = solve_greedy_with_order(transactions, order, deadline)
             if len(result) > len(best_result):
                 best_result = result
     
     else:
         # For large datasets: simpler and faster strategies
-        max_attempts = min(3, max(1, int((MAX_EXECUTION_TIME - (time.time() - start_time)) * 2)))
+        max_attempts = min(3, max(1, int((deadline - time.time()) * 2)))
         
         attempts = 0
-        while attempts < max_attempts and time.time() - start_time < MAX_EXECUTION_TIME - 0.2:
+        while attempts < max_attempts and time.time() < deadline:
             if attempts == 0:
                 # Strategy 1: Sort by write set size (ascending)
                 write_sizes = [(len(transactions[i][1]), i) for i in range(n)]
@@ -142,7 +388,7 @@ def try_additional_improvements(transactions, initial_result, start_time):
                 total_sizes.sort()
                 order = [i for _, i in total_sizes]
             
-            result = solve_greedy_with_order(transactions, order, start_time)
+            result = solve_greedy_with_order(transactions, order, deadline)
             if len(result) > len(best_result):
                 best_result = result
             
@@ -150,169 +396,838 @@ def try_additional_improvements(transactions, initial_result, start_time):
     
     return best_result
 
-def solve():
-    start_time = time.time()
-    # Read input
-    n, m = map(int, input().split())
+class TopologicalOrder:
+    """Incremental topological order of a set of selected transactions.
     
-    # Read all transactions
-    transactions = []
-    for _ in range(n):
-        read_set, write_set = read_transaction()
-        transactions.append((set(read_set), set(write_set)))
+    A transaction that reads a cell has to run before every other one that
+    writes it. Positions are float keys kept consistent with that rule the
+    Pearce-Kelly way: inserting a transaction only reorders the selected
+    ones between its latest required predecessor and earliest required
+    successor, so a move costs time in its neighbourhood, not in n.
+    """
     
-    # For very large datasets, use simplified multi-start approach
-    if n > HUGE_DATASET_THRESHOLD:
-        result = solve_with_multiple_starts(transactions, start_time, max_attempts=2)
+    def __init__(self, transactions):
+        self.transactions = transactions
+        self.cell_to_readers = defaultdict(list)
+        self.cell_to_writers = defaultdict(list)
+        for i, (read_set, write_set) in enumerate(transactions):
+            for cell in read_set:
+                self.cell_to_readers[cell].append(i)
+            for cell in write_set:
+                self.cell_to_writers[cell].append(i)
+        self.key = {}  # Selected transaction -> position
+        self.used = set()  # Positions in use; equal positions would break ties
+        self.low = 0.0
+        self.high = 0.0
+        self.blocker = None  # A predecessor that made the last insert fail
+    
+    def __len__(self):
+        return len(self.key)
+    
+    def __contains__(self, v):
+        return v in self.key
+    
+    def successors(self, v):
+        """Selected transactions that have to run after v."""
+        for cell in self.transactions[v][0]:
+            for w in self.cell_to_writers[cell]:
+                if w != v and w in self.key:
+                    yield w
+    
+    def predecessors(self, v):
+        """Selected transactions that have to run before v."""
+        for cell in self.transactions[v][1]:
+            for u in self.cell_to_readers[cell]:
+                if u != v and u in self.key:
+                    yield u
+    
+    def neighbours(self, v):
+        """All transactions sharing a conflict with v, selected or not."""
+        for cell in self.transactions[v][1]:
+            yield from self.cell_to_readers[cell]
+        for cell in self.transactions[v][0]:
+            yield from self.cell_to_writers[cell]
+    
+    def insert(self, v):
+        """Select v if that keeps the order acyclic; return whether it did."""
+        key = self.key
+        before = list(self.predecessors(v))
+        after = list(self.successors(v))
+        if not before:
+            self.low -= 1.0
+            return self._place(v, self.low)
+        if not after:
+            self.high += 1.0
+            return self._place(v, self.high)
+        
+        upper = max(key[u] for u in before)
+        lower = min(key[w] for w in after)
+        if lower > upper:
+            return self._place(v, self._between(upper, lower))
+        
+        # Selected transactions forced after v that now sit before its
+        # latest predecessor; reaching a predecessor means a cycle
+        forward = self._reach(after, self.successors, lambda x: key[x] <= upper, set(before))
+        if forward is None:
+            return False
+        backward = self._reach(before, self.predecessors, lambda x: key[x] >= lower)
+        
+        # Reuse the affected positions: predecessors first, then successors
+        slots = sorted(key[x] for x in backward | forward)
+        moved = sorted(backward, key=key.get) + sorted(forward, key=key.get)
+        for x, slot in zip(moved, slots):
+            key[x] = slot
+        return self._place(v, self._between(slots[len(backward) - 1], slots[len(backward)]))
+    
+    def _between(self, left, right):
+        # A free position strictly between left and right, None if the
+        # floats ran out
+        while True:
+            middle = (left + right) / 2
+            if not left < middle < right:
+                return None
+            if middle not in self.used:
+                return middle
+            right = middle
+    
+    def _place(self, v, position):
+        if position is None:
+            self.renumber()
+            return self.insert(v)
+        self.key[v] = position
+        self.used.add(position)
+        return True
+    
+    def _reach(self, starts, step, inside, stop=()):
+        # Everything reachable through inside nodes; None, with the node
+        # kept as blocker, as soon as a stop node is reached
+        seen = set()
+        stack = [x for x in starts if inside(x)]
+        while stack:
+            x = stack.pop()
+            if x in seen:
+                continue
+            if x in stop:
+                self.blocker = x
+                return None
+            seen.add(x)
+            for y in step(x):
+                if y not in seen and inside(y):
+                    stack.append(y)
+        return seen
+    
+    def remove(self, v):
+        """Deselect v; the order of the others stays valid."""
+        self.used.discard(self.key.pop(v))
+    
+    def renumber(self):
+        """Spread the positions out again when floats get too close."""
+        for rank, v in enumerate(sorted(self.key, key=self.key.get)):
+            self.key[v] = float(rank)
+        self.used = set(self.key.values())
+        self.low = -1.0
+        self.high = float(len(self.key))
+    
+    def order(self):
+        """Selected transactions (1-based) in an executable order."""
+        return [v + 1 for v in sorted(self.key, key=self.key.get)]
+
+def local_search(transactions, initial_result, deadline):
+    """Improve a result with add, drop and swap moves until the time runs out.
+    
+    A transaction that cannot be added is swapped in for a selected
+    predecessor that blocks it, the dropped one is tabu for a while, and its
+    neighbours get a chance to fill the room it left. When nothing improves
+    for long a random selected transaction is dropped to move elsewhere.
+    """
+    n = len(transactions)
+    # Indexing the cells and inserting the start take time linear in the
+    # reads and writes; when that does not fit in half the time left, the
+    # initial result is returned right away
+    entries = sum(len(read_set) + len(write_set) for read_set, write_set in transactions)
+    if entries * LOCAL_SEARCH_ENTRY_COST > (deadline - time.time()) / 2:
+        return initial_result
+    clock = Deadline(deadline)
+    order = TopologicalOrder(transactions)
+    for i in initial_result:
+        if clock.passed():
+            return initial_result
+        order.insert(i - 1)
+    
+    # Unselected transactions, with positions for O(1) random picks
+    outside = [v for v in range(n) if v not in order]
+    where = {v: k for k, v in enumerate(outside)}
+    
+    def leave(v):
+        k = where.pop(v)
+        last = outside.pop()
+        if last != v:
+            outside[k] = last
+            where[last] = k
+    
+    def enter(v):
+        where[v] = len(outside)
+        outside.append(v)
+    
+    def add(v):
+        if order.insert(v):
+            leave(v)
+            return True
+        return False
+    
+    def drop(v):
+        order.remove(v)
+        enter(v)
+    
+    for v in outside[:]:
+        if clock.passed():
+            break
+        add(v)
+    
+    best = initial_result
+    best_size = len(order)
+    tabu = {}
+    step = 0
+    stalled = 0
+    while outside:
+        step += 1
+        if clock.passed():
+            break
+        
+        v = random.choice(outside)
+        if tabu.get(v, 0) > step:
+            continue
         
-        # Try additional improvements if we have time left
-        time_left = MAX_EXECUTION_TIME - (time.time() - start_time)
-        if time_left > 0.3:
-            improved_result = try_additional_improvements(transactions, result, start_time)
-            if len(improved_result) > len(result):
-                result = improved_result
+        if not add(v):
+            # Swap v in for the blocker, then refill around the blocker
+            x = order.blocker
+            order.remove(x)
+            if order.insert(v):
+                leave(v)
+                enter(x)
+                tabu[x] = step + 5 + random.randrange(10)
+                for u in set(order.neighbours(x)):
+                    if u in where and tabu.get(u, 0) <= step:
+                        add(u)
+                        if clock.passed():
+                            break
+            else:
+                order.insert(x)
+        stalled += 1
         
-        print(len(result))
-        print(*result)
-        return
+        # Only a drop shrinks the selection, so the best is saved right before
+        if len(order) > best_size:
+            best_size = len(order)
+            stalled = 0
+            if TELEMETRY is not None:
+                TELEMETRY.best(best_size)
+        elif stalled > 2 * n:
+            if len(order) > len(best):
+                best = order.order()
+            drop(random.choice(list(order.key)))
+            stalled = 0
+    
+    if len(order) > len(best):
+        best = order.order()
+    return best
+
+def pack_csr(offsets, cells):
+    """Join the CSR arrays into one int32 array: n, offsets, then cells."""
+    return array('i', [(len(offsets) - 1) // 2]) + offsets + cells
+
+def unpack_csr(values):
+    """Split pack_csr output back into offsets and cells."""
+    n = values[0]
+    return values[1:2 * n + 2], values[2 * n + 2:]
+
+def strategy_order(transactions, strategy):
+    """Greedy preference order for a portfolio start strategy."""
+    n = len(transactions)
+    order = list(range(n))
+    random.shuffle(order)  # Random tie-breaking for the sorted strategies
+    if strategy == "write_size":
+        order.sort(key=lambda i: len(transactions[i][1]))
+    elif strategy == "ratio":
+        order.sort(key=lambda i: -len(transactions[i][0]) / max(len(transactions[i][1]), 1))
+    return order
+
+def portfolio_worker(task):
+    """Run one start strategy and local search on the shared transactions."""
+    name, strategy, seed, incumbent, deadline = task
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        values = array('i')
+        values.frombytes(block.buf)
+    finally:
+        block.close()  # The parent owns the block and unlinks it
+    
+    transactions = csr_to_sets(*unpack_csr(values))
+    random.seed(seed)
+    result = incumbent
+    if strategy != "incumbent":
+        order = strategy_order(transactions, strategy)
+        result = solve_greedy_with_order(transactions, order, deadline)
+    return local_search(transactions, result, deadline)
+
+def run_portfolio(offsets, cells, incumbent, deadline, workers):
+    """Run the start strategies in worker processes and keep the best result.
+    
+    The CSR arrays are shared read-only as one block in shared memory;
+    every worker improves its own start with local search until shortly
+    before deadline, so its result is back in time.
+    """
+    # Workers stop a little early, so their results are back by deadline
+    now = time.time()
+    worker_deadline = now + (deadline - now) * (1 - SAFETY_SHARE)
+    data = pack_csr(offsets, cells)
+    block = shared_memory.SharedMemory(create=True, size=len(data) * data.itemsize)
+    best_result = incumbent
+    try:
+        block.buf[:len(data) * data.itemsize] = data.tobytes()
+        tasks = [(block.name, PORTFOLIO_STRATEGIES[k % len(PORTFOLIO_STRATEGIES)], k, incumbent, worker_deadline)
+                 for k in range(workers)]
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.imap_unordered(portfolio_worker, tasks)
+            for _ in tasks:
+                timeout = deadline - time.time()
+                try:
+                    result = results.next(timeout=max(timeout, 0))
+                except multiprocessing.TimeoutError:
+                    break
+                if len(result) > len(best_result):
+                    best_result = result
+    finally:
+        block.close()
+        block.unlink()
+    return best_result
+
+def iter_bits(mask):
+    """Yield the indices of the set bits of mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def build_conflict_masks(transactions):
+    """Build the writer -> reader conflict graph as bit masks.
+    
+    Bit j of successors[i] is set when transaction i writes a cell that
+    transaction j reads, so j has to run before i; predecessors is the
+    transpose. Reading a cell it writes itself does not conflict, so there
+    are no self-edges.
+    """
+    n = len(transactions)
+    cell_to_readers = defaultdict(int)
+    for j, (read_set, _) in enumerate(transactions):
+        for cell in read_set:
+            cell_to_readers[cell] |= 1 << j
+    
+    successors = []
+    for i, (_, write_set) in enumerate(transactions):
+        mask = 0
+        for cell in write_set:
+            mask |= cell_to_readers.get(cell, 0)
+        successors.append(mask & ~(1 << i))
+    
+    predecessors = [0] * n
+    for i, mask in enumerate(successors):
+        for j in iter_bits(mask):
+            predecessors[j] |= 1 << i
+    return successors, predecessors
+
+def order_acyclic(chosen, successors):
+    """Order the chosen transactions so every reader runs before its writers."""
+    result = []
+    remaining = chosen
+    while remaining:
+        ready = [v for v in iter_bits(remaining) if not successors[v] & remaining]
+        for v in ready:
+            result.append(v + 1)
+            remaining &= ~(1 << v)
+    return result
+
+class ExactTimeout(Exception):
+    """Raised inside the exact search when its time budget runs out."""
+
+def solve_exact(transactions, incumbent, deadline):
+    """Find a largest executable set by branch and bound.
+    
+    A set is executable exactly when its conflict graph is acyclic. The
+    search keeps kept/free bit masks; vertices with no in- or out-edge among
+    the live ones lie on no cycle and are settled as kept, and free vertices
+    that would close a cycle with the kept ones are forced out. The bound
+    subtracts a vertex-disjoint packing of cycles, 2-cycles first, since
+    each of them has to lose a vertex, and failed (kept, free) states are
+    memoised.
+    
+    Returns (result, proven): the incumbent is kept unless beaten, and proven
+    tells whether the search finished before deadline.
+    """
+    successors, predecessors = build_conflict_masks(transactions)
+    best = [len(incumbent), None]  # size and chosen mask of the best set
+    failed = {}  # (kept, free) -> largest settled count it failed with
+    clock = Deadline(deadline)
+    
+    def closes_cycle(v, kept):
+        # v lies on a cycle through kept iff something it reaches points back
+        reached = 0
+        frontier = successors[v] & kept
+        while frontier:
+            reached |= frontier
+            step = 0
+            for u in iter_bits(frontier):
+                step |= successors[u]
+            frontier = step & kept & ~reached
+        return bool(reached & predecessors[v])
+    
+    def shortest_cycle(v, live):
+        # Breadth-first from v until an edge leads back to v
+        parent = {v: None}
+        frontier = [v]
+        seen = 1 << v
+        while frontier:
+            step = []
+            for u in frontier:
+                if successors[u] >> v & 1:
+                    cycle = 0
+                    while u is not None:
+                        cycle |= 1 << u
+                        u = parent[u]
+                    return cycle
+                for w in iter_bits(successors[u] & live & ~seen):
+                    seen |= 1 << w
+                    parent[w] = u
+                    step.append(w)
+            frontier = step
+        return 0
+    
+    def packed_cycles(live):
+        # 2-cycles first, they are cheap to find and lose the most per vertex;
+        # then a shortest cycle through the busiest vertex, until none is left
+        cycles = []
+        for v in iter_bits(live):
+            if live >> v & 1:
+                partners = successors[v] & predecessors[v] & live
+                if partners:
+                    cycle = (1 << v) | (partners & -partners)
+                    cycles.append(cycle)
+                    live &= ~cycle
+        while True:
+            peeled = True
+            while peeled:
+                peeled = False
+                for v in iter_bits(live):
+                    if not successors[v] & live or not predecessors[v] & live:
+                        live &= ~(1 << v)
+                        peeled = True
+            if not live:
+                return cycles
+            v = max(iter_bits(live), key=lambda u: (successors[u] & live).bit_count() *
+                                                   (predecessors[u] & live).bit_count())
+            cycle = shortest_cycle(v, live)
+            if cycle:
+                cycles.append(cycle)
+                live &= ~cycle
+            else:
+                live &= ~(1 << v)  # On no cycle at all
+    
+    def search(settled, kept, free):
+        if clock.passed():
+            raise ExactTimeout()
+        
+        # Reduce until nothing changes
+        changed = True
+        while changed:
+            changed = False
+            live = kept | free
+            for v in iter_bits(live):
+                bit = 1 << v
+                if not successors[v] & live or not predecessors[v] & live:
+                    settled |= bit
+                    kept &= ~bit
+                    free &= ~bit
+                    live &= ~bit
+                    changed = True
+                elif free & bit and closes_cycle(v, kept):
+                    free &= ~bit
+                    live &= ~bit
+                    changed = True
+        
+        base = settled.bit_count()
+        if not free:
+            if base + kept.bit_count() > best[0]:
+                best[0] = base + kept.bit_count()
+                best[1] = settled | kept
+            return
+        
+        key = (kept, free)
+        if failed.get(key, -1) >= base:
+            return
+        
+        # Upper bound: a cycle loses at least one free vertex, so pack
+        # vertex-disjoint cycles, shortest first, and count them
+        live = kept | free
+        lost = len(packed_cycles(live))
+        if base + live.bit_count() - lost <= best[0]:
+            failed[key] = base
+            return
+        
+        # Branch on the free vertex with the most cycles through it
+        v = max(iter_bits(free), key=lambda u: (successors[u] & live).bit_count() *
+                                               (predecessors[u] & live).bit_count())
+        bit = 1 << v
+        search(settled, kept | bit, free & ~bit)
+        search(settled, kept, free & ~bit)
+        # Fully searched: nothing below beats best with this many settled
+        failed[key] = max(failed.get(key, -1), base)
+    
+    try:
+        search(0, 0, (1 << len(transactions)) - 1)
+        proven = True
+    except ExactTimeout:
+        proven = False
+    
+    if best[1] is None:
+        return incumbent, proven
+    return order_acyclic(best[1], successors), proven
+
+def solve_heap_greedy(transactions, deadline, mode=None):
+    """Pick transactions one by one, best first, and return the order.
+    
+    The candidates sit in a lazy heap: a pick re-keys only the transactions
+    whose score it changed, found through the cell indexes, and stale heap
+    entries are skipped when popped.
+    
+    With mode None the greedy plans to use GREEDY_SHARE of the time to
+    deadline. It starts in "complex" mode if the victim precompute fits in
+    half of that, and it measures its own cost per pick: when the picks
+    still to come would not fit at that cost, it steps down to "simple" and
+    then "ultra_fast". A given mode is kept all the way.
+    """
+    n = len(transactions)
+    telemetry = TELEMETRY
+    since = time.time()
     
     # Initialize data structures
     result = []
     corrupted_cells = set()  # Track corrupted cells
     
-    # Determine initial algorithm choice
-    initial_algorithm_mode = ""
-    if n <= MEDIUM_DATASET_THRESHOLD:
-        initial_algorithm_mode = "complex"
-    else: # MEDIUM_DATASET_THRESHOLD < n <= HUGE_DATASET_THRESHOLD
-        initial_algorithm_mode = "simple"
+    # Time the greedy plans to finish by
+    greedy_end = time.time() + (deadline - time.time()) * GREEDY_SHARE
 
-    # Precompute data if needed
+    # Precompute which transactions read from and write to each cell
     cell_to_readers = defaultdict(set)
-    potential_victims = {}
+    cell_to_writers = defaultdict(list)
+    for i, (read_set, write_set) in enumerate(transactions):
+        for cell in read_set:
+            cell_to_readers[cell].add(i)
+        for cell in write_set:
+            cell_to_writers[cell].append(i)
     
-    if initial_algorithm_mode == "complex":
-        # Precompute which transactions read from each cell
-        for i, (read_set, _) in enumerate(transactions):
-            for cell in read_set:
-                cell_to_readers[cell].add(i)
-        
-        # Precompute potential impact for each transaction (approximation)
+    # Available transactions read no corrupted cell, so all their reads stay
+    # available; only the corrupted part of their writes changes over time.
+    read_counts = [len(read_set) for read_set, _ in transactions]
+    write_counts = [len(write_set) for _, write_set in transactions]
+    corrupted_writes = [0] * n
+    
+    # Precompute potential impact for each transaction (approximation):
+    # live_victims[i] counts its victims that are still available and
+    # attackers[j] lists the transactions whose victim j is. Keeping them
+    # current costs about as much again, so "complex" mode is used only
+    # when this fits in half the greedy's time. It visits every reader of
+    # every written cell, which is counted first in O(total writes); the
+    # precompute still gives up if it runs over the estimate.
+    adaptive = mode is None
+    if adaptive:
+        visits = 0
+        for _, write_set in transactions:
+            for cell in write_set:
+                visits += len(cell_to_readers.get(cell, ()))
+        fits = visits * VICTIM_VISIT_COST < (greedy_end - time.time()) / 2
+        mode = "complex" if fits else "simple"
+    attackers = None
+    live_victims = [0] * n
+    if mode == "complex":
+        attackers = [[] for _ in range(n)]
+        precompute = Deadline(time.time() + (greedy_end - time.time()) / 2)
         for i, (_, write_set) in enumerate(transactions):
+            if adaptive and precompute.passed():
+                mode = "simple"
+                attackers = None
+                break
             victims = set()
             for cell in write_set:
                 victims.update(cell_to_readers[cell])
             victims.discard(i)  # Don't count self
-            potential_victims[i] = victims
+            for j in victims:
+                attackers[j].append(i)
+            live_victims[i] = len(victims)
+    if telemetry is not None:
+        since = telemetry.phase("precompute", since)
+        telemetry.switch(mode)
+    
+    # Heap keys, smallest first. "simple" prefers more reads, then fewer new
+    # corruptions; "complex" prefers fewer available victims (the most
+    # remaining transactions), then more reads.
+    def simple_key(i):
+        return (-read_counts[i], write_counts[i] - corrupted_writes[i], i)
+    
+    def complex_key(i):
+        return (live_victims[i], -read_counts[i], i)
     
     # Try to build the longest sequence
     available_transactions = set(range(n))
+    heap = []
+    heap_mode = None
+    key = None
+    
+    # Cost per pick is measured over batches of picks, one clock read each
+    batch = 16
+    batch_start = time.time()
+    scored = 0  # Candidates scored in the current mode
     
     while available_transactions:
-        current_time = time.time() - start_time
+        if len(result) % batch == 0 and result:
+            now = time.time()
+            if now > deadline:
+                break
+            # Project the picks still to come from the share of removed
+            # transactions that were picked so far, at this mode's cost
+            cost = (now - batch_start) / batch
+            batch_start = now
+            picks_left = len(available_transactions) * len(result) / (n - len(available_transactions))
+            if adaptive and mode != "ultra_fast" and now + cost * picks_left > greedy_end:
+                if telemetry is not None:
+                    telemetry.scored[mode] += scored
+                    scored = 0
+                mode = "simple" if mode == "complex" else "ultra_fast"
+                attackers = None  # Victim counts are only kept for "complex"
+                if telemetry is not None:
+                    telemetry.switch(mode)
         
-        if current_time > MAX_EXECUTION_TIME:
-            break
-            
-        # Determine effective algorithm mode based on initial choice and time
-        effective_algorithm_mode = initial_algorithm_mode
-        if current_time > SWITCH_TO_ULTRA_FAST_TIME:
-            effective_algorithm_mode = "ultra_fast"
-        elif current_time > SWITCH_TO_SIMPLE_TIME:
-            if effective_algorithm_mode == "complex": # Downgrade complex to simple
-                effective_algorithm_mode = "simple"
-            # If it was already simple, it stays simple until ultra_fast kicks in
-            
         # Find the best transaction to add
         best_transaction = None
         
-        if effective_algorithm_mode == "ultra_fast":
+        if mode == "ultra_fast":
             # Ultra-fast algorithm: simple sampling + basic scoring
             sample_size = min(50, len(available_transactions))
             if len(available_transactions) > sample_size:
                 candidates = random.sample(list(available_transactions), sample_size)
             else:
                 candidates = list(available_transactions)
+            scored += len(candidates)
             
             best_score = float('inf')
             for i in candidates:
-                if time.time() - start_time > MAX_EXECUTION_TIME:
-                    break
-                read_set, write_set = transactions[i]
-                if read_set & corrupted_cells:
-                    continue
-                score = len(write_set)
+                score = write_counts[i]
                 if score < best_score:
                     best_score = score
                     best_transaction = i
-                    
-        elif effective_algorithm_mode == "simple":
-            # Enhanced simple algorithm with better scoring
-            best_score = (-1, float('inf'))  # (available_reads, -corruption_count)
-            for i in available_transactions:
-                if time.time() - start_time > MAX_EXECUTION_TIME:
-                    break
-                read_set, write_set = transactions[i]
-                if read_set & corrupted_cells:
-                    continue
-                available_reads = len(read_set - corrupted_cells)
-                corruption_count = len(write_set - corrupted_cells)
-                current_score = (available_reads, -corruption_count)
-                if current_score > best_score:
-                    best_score = current_score
-                    best_transaction = i
         
-        elif effective_algorithm_mode == "complex": # And initial_algorithm_mode was "complex"
-            # Complex algorithm: use approximation for speed
-            best_score = (-1, -1)  # (remaining_transactions_estimate, available_reads)
-            for i in available_transactions:
-                if time.time() - start_time > MAX_EXECUTION_TIME:
-                    break
-                read_set, write_set = transactions[i]
-                if read_set & corrupted_cells:
-                    continue
-                affected_transactions = potential_victims[i] & available_transactions
-                remaining_estimate = len(available_transactions) - 1 - len(affected_transactions)
-                available_reads = len(read_set - corrupted_cells)
-                score = (remaining_estimate, available_reads)
-                if score > best_score:
-                    best_score = score
+        else:
+            # Rebuild the heap when the mode (and so the key) changes
+            if heap_mode != mode:
+                heap_mode = mode
+                key = simple_key if heap_mode == "simple" else complex_key
+                heap = [key(i) for i in available_transactions]
+                heapq.heapify(heap)
+                scored += len(heap)
+            
+            # Skip entries of unavailable transactions and outdated keys
+            while heap:
+                scored += 1
+                entry = heapq.heappop(heap)
+                i = entry[-1]
+                if i in available_transactions and entry == key(i):
                     best_transaction = i
+                    break
         
         if best_transaction is None:
             break
             
         # Add the best transaction
         result.append(best_transaction + 1)
-        available_transactions.remove(best_transaction)
+        removed = {best_transaction}
+        changed = set()
         
-        # Update corrupted cells
-        _, write_set = transactions[best_transaction]
-        corrupted_cells.update(write_set)
+        # Update corrupted cells. Only readers of the cells just corrupted
+        # can become unavailable and only their writers change score; a cell
+        # is popped from the reader index once corrupted, so each index entry
+        # is visited at most once over the whole run.
+        for cell in transactions[best_transaction][1]:
+            if cell in corrupted_cells:
+                continue
+            corrupted_cells.add(cell)
+            for i in cell_to_writers[cell]:
+                corrupted_writes[i] += 1
+                changed.add(i)
+            readers = cell_to_readers.pop(cell, None)
+            if readers:
+                removed.update(readers & available_transactions)
         
         # Remove transactions that can no longer be executed
-        # Check if effective_algorithm_mode is ultra_fast for less frequent cleanup
-        is_ultra_fast_now = (effective_algorithm_mode == "ultra_fast")
-        if not is_ultra_fast_now or len(result) % 20 == 0:
-            to_remove = set()
-            for i in available_transactions:
-                if time.time() - start_time > MAX_EXECUTION_TIME:
-                    break
-                read_set, _ = transactions[i]
-                if read_set & corrupted_cells:
-                    to_remove.add(i)
-            available_transactions -= to_remove
+        available_transactions -= removed
+        if attackers is not None:
+            for j in removed:
+                for i in attackers[j]:
+                    live_victims[i] -= 1
+                    changed.add(i)
+        
+        # Re-key the changed transactions; their old entries go stale
+        if heap_mode is not None:
+            changed &= available_transactions
+            scored += len(changed)
+            for i in changed:
+                heapq.heappush(heap, key(i))
+    if telemetry is not None:
+        telemetry.scored[mode] += scored
+        telemetry.phase("greedy", since)
+        telemetry.best(len(result))
+    return result
+
+def solve_instance(offsets, cells, deadline, workers=1):
+    """Solve the transactions in the CSR arrays and return the chosen order.
+    
+    Huge instances get the multi-start greedy on the flat arrays, the rest
+    solve_heap_greedy and, when small enough, the exact solver. The time
+    left goes to improvements and local search; with workers > 1 it goes to
+    a portfolio in that many processes instead.
+    """
+    n = (len(offsets) - 1) // 2
+    # For very large datasets, use simplified multi-start approach directly
+    # on the flat arrays
+    telemetry = TELEMETRY
+    since = time.time()
+    reserve = (deadline - since) * LOCAL_SEARCH_SHARE
+    if n > HUGE_DATASET_THRESHOLD:
+        # Local search first builds the sets, cell indexes and its start, a
+        # good part of a second at this size, and only runs if that fits in
+        # half the time left; when it can, the multi-start leaves it that
+        setup = len(cells) * (SETS_ENTRY_COST + LOCAL_SEARCH_ENTRY_COST)
+        if deadline - since > 2 * setup:
+            reserve = max(reserve, 2 * setup)
+        result = solve_with_multiple_starts(offsets, cells, deadline, reserve)
+        if telemetry is not None:
+            since = telemetry.phase("multi_start", since)
+        
+        # Spend what is left on local search around the best result
+        if deadline - time.time() > 2 * setup:
+            if workers > 1:
+                result = run_portfolio(offsets, cells, result, deadline, workers)
+                phase = "portfolio"
+            else:
+                result = local_search(csr_to_sets(offsets, cells), result, deadline)
+                phase = "local_search"
+            if telemetry is not None:
+                telemetry.phase(phase, since)
+                telemetry.best(len(result))
+        return result
+    
+    transactions = csr_to_sets(offsets, cells)
+    
+    if telemetry is not None:
+        since = telemetry.phase("precompute", since)
+    result = solve_heap_greedy(transactions, deadline)
+    since = time.time()
+    
+    # Small instances: search for a proven optimum, seeded with the greedy
+    proven = False
+    if n <= EXACT_DATASET_THRESHOLD:
+        now = time.time()
+        result, proven = solve_exact(transactions, result, now + (deadline - now) * EXACT_SHARE)
+        if telemetry is not None:
+            since = telemetry.phase("exact", since)
+            telemetry.best(len(result))
     
     # Try additional improvements if we have time left
-    time_left = MAX_EXECUTION_TIME - (time.time() - start_time)
-    if time_left > 0.3:
-        improved_result = try_additional_improvements(transactions, result, start_time)
+    time_left = deadline - time.time()
+    if proven or time_left <= 0:
+        pass
+    elif workers > 1:
+        result = run_portfolio(offsets, cells, result, deadline, workers)
+        if telemetry is not None:
+            telemetry.phase("portfolio", since)
+            telemetry.best(len(result))
+    else:
+        improved_result = try_additional_improvements(transactions, result, deadline - reserve)
         if len(improved_result) > len(result):
             result = improved_result
+        if telemetry is not None:
+            since = telemetry.phase("improvements", since)
+            telemetry.best(len(result))
+        
+        # Spend what is left on local search around the best result
+        if deadline - time.time() > 0:
+            result = local_search(transactions, result, deadline)
+            if telemetry is not None:
+                telemetry.phase("local_search", since)
+                telemetry.best(len(result))
+    
+    return result
+
+def solve(workers=1):
+    """Read the input, solve and print the answer.
+    
+    Transactions on no conflict cycle are accepted right away. The cyclic
+    components are solved one by one, smallest first, each with a share of
+    the remaining time in proportion to its size; cycles never cross
+    components, so their best answers combine into the best overall.
+    """
+    global TELEMETRY
+    start_time = time.time()
+    telemetry = TELEMETRY = Telemetry(TELEMETRY_TARGET) if TELEMETRY_TARGET else None
+    # Read input
+    n, m, offsets, cells = read_input()
+    # Freeing the solver structures, building and printing the answer and
+    # tearing down at exit take time in proportion to n
+    deadline = start_time + MAX_EXECUTION_TIME * (1 - SAFETY_SHARE) - n * FINISH_COST
+    if telemetry is not None:
+        since = telemetry.phase("parse", start_time)
+    
+    # The decomposition takes time linear in the reads and writes and has
+    # to fit in its share of the time left; otherwise, or if it runs over,
+    # the whole input is solved as one component
+    now = time.time()
+    components = None
+    if len(cells) * DECOMPOSE_ENTRY_COST < (deadline - now) * DECOMPOSE_SHARE:
+        components = conflict_components(n, offsets, cells, now + (deadline - now) * DECOMPOSE_SHARE)
+    if components is None:
+        components = [list(range(n))] if n else []
+    cyclic = sorted((component for component in components if len(component) > 1), key=len)
+    if telemetry is not None:
+        telemetry.phase("decompose", since)
+        telemetry.accepted = len(components) - len(cyclic)
+        telemetry.curve.append([telemetry.elapsed(), telemetry.accepted])
+    solutions = {}
+    remaining = sum(len(component) for component in cyclic)
+    for component in cyclic:
+        now = time.time()
+        share = (deadline - now) * len(component) / remaining
+        remaining -= len(component)
+        if len(component) == n:
+            sub_offsets, sub_cells = offsets, cells
+        else:
+            sub_offsets, sub_cells = csr_subset(offsets, cells, component)
+        component_deadline = now + share
+        if telemetry is not None:
+            telemetry.component = component[0] + 1
+        local = solve_instance(sub_offsets, sub_cells, component_deadline, workers)
+        solutions[component[0]] = [component[i - 1] + 1 for i in local]
+    
+    # Components come sinks first, which already is an executable order
+    result = []
+    for component in components:
+        if len(component) > 1:
+            result.extend(solutions[component[0]])
+        else:
+            result.append(component[0] + 1)
     
     # Output result
     print(len(result))
     print(*result)
+    if telemetry is not None:
+        telemetry.write()
+        TELEMETRY = None
 
 def test_solution():
     """Run test with example input data."""
@@ -370,14 +1285,200 @@ def test_solution():
         import traceback
         traceback.print_exc(file=original_stdout)
 
+def random_instance(rng, n, m, hot=0.2):
+    """Random test transactions: (input text, offsets, cells, transaction sets)."""
+    from benchmark import generate_transactions, parse, to_text
+    text = to_text(m, generate_transactions(rng, n, m, 3, 3, "uniform", hot))
+    _, _, offsets, cells = parse(text)
+    return text, offsets, cells, csr_to_sets(offsets, cells)
+
+def conflict_edges(transactions):
+    """Bit j of edges[i] is set when i writes a cell j reads (j runs first)."""
+    n = len(transactions)
+    return [sum(1 << j for j in range(n) if j != i and transactions[i][1] & transactions[j][0])
+            for i in range(n)]
+
+def is_acyclic(edges, mask):
+    """Whether the transactions in mask can all run, by peeling off free ones."""
+    while mask:
+        free = 0
+        for i in range(len(edges)):
+            if mask >> i & 1 and not edges[i] & mask:
+                free |= 1 << i
+        if not free:
+            return False
+        mask &= ~free
+    return True
+
+def brute_force_size(transactions):
+    """Size of a largest executable set, by trying every subset."""
+    edges = conflict_edges(transactions)
+    best = 0
+    for mask in range(1 << len(transactions)):
+        size = bin(mask).count("1")
+        if size > best and is_acyclic(edges, mask):
+            best = size
+    return best
+
+def test_exact_solver():
+    """Compare solve_exact with brute force on random instances with n <= 12."""
+    from benchmark import check_order
+    rng = random.Random(18)
+    failures = 0
+    for _ in range(150):
+        n = rng.randint(1, 12)
+        _, offsets, cells, transactions = random_instance(rng, n, rng.randint(3, 15))
+        result, proven = solve_exact(transactions, [], time.time() + 5)
+        check_order(offsets, cells, result)
+        expected = brute_force_size(transactions)
+        if not proven or len(result) != expected:
+            failures += 1
+            print(f"Exact solver found {len(result)} (proven: {proven}), brute force {expected}", flush=True)
+    print("Exact Solver Status:", "PASSED" if failures == 0 else "FAILED", flush=True)
+
+def test_local_search():
+    """Check TopologicalOrder against brute force and local_search results with check_order."""
+    from benchmark import check_order
+    rng = random.Random(19)
+    failures = 0
+    for _ in range(100):
+        _, offsets, cells, transactions = random_instance(rng, rng.randint(1, 12), rng.randint(3, 15))
+        edges = conflict_edges(transactions)
+        order = TopologicalOrder(transactions)
+        mask = 0
+        for _ in range(40):
+            v = rng.randrange(len(transactions))
+            if v in order:
+                order.remove(v)
+                mask &= ~(1 << v)
+            elif order.insert(v) != is_acyclic(edges, mask | 1 << v):
+                failures += 1
+                print(f"TopologicalOrder insert of {v} disagrees with brute force", flush=True)
+                break
+            elif v in order:
+                mask |= 1 << v
+            check_order(offsets, cells, order.order())
+    
+    random.seed(19)
+    for n in (12, 300):
+        _, offsets, cells, transactions = random_instance(rng, n, 2 * n)
+        start = solve_greedy_with_order(transactions, strategy_order(transactions, "shuffle"), time.time() + 1)
+        result = local_search(transactions, start, time.time() + 0.2)
+        check_order(offsets, cells, result)
+        if len(result) < len(start):
+            failures += 1
+            print(f"Local search shrank {len(start)} to {len(result)}", flush=True)
+    print("Local Search Status:", "PASSED" if failures == 0 else "FAILED", flush=True)
+
+def test_portfolio():
+    """Run the portfolio on a random instance and check its result with check_order."""
+    from benchmark import check_order
+    rng = random.Random(20)
+    _, offsets, cells, transactions = random_instance(rng, 300, 600)
+    incumbent = solve_with_multiple_starts(offsets, cells, time.time() + 0.2)
+    result = run_portfolio(offsets, cells, incumbent, time.time() + 0.5, 2)
+    check_order(offsets, cells, result)
+    passed = len(result) >= len(incumbent)
+    if not passed:
+        print(f"Portfolio shrank {len(incumbent)} to {len(result)}", flush=True)
+    print("Portfolio Status:", "PASSED" if passed else "FAILED", flush=True)
+
+def test_components():
+    """Run solve() on disjoint random components and compare with brute force per component."""
+    global MAX_EXECUTION_TIME, DECOMPOSE_ENTRY_COST
+    from benchmark import check_order, generate_transactions, parse, to_text
+    rng = random.Random(22)
+    failures = 0
+    original_budget, original_cost = MAX_EXECUTION_TIME, DECOMPOSE_ENTRY_COST
+    original_stdin, original_stdout = sys.stdin, sys.stdout
+    try:
+        MAX_EXECUTION_TIME = 0.5
+        for _ in range(5):
+            # Each component uses its own range of cells
+            raw, expected = [], 0
+            for k in range(rng.randint(2, 6)):
+                part = generate_transactions(rng, rng.randint(1, 10), 10, 3, 3, "uniform", 0.2)
+                raw += [([c + 10 * k for c in reads], [c + 10 * k for c in writes]) for reads, writes in part]
+                _, _, offsets, cells = parse(to_text(10, part))
+                expected += brute_force_size(csr_to_sets(offsets, cells))
+            text = to_text(10 * k + 10, raw)
+            sys.stdin = StringIO(text)
+            sys.stdout = StringIO()
+            solve()
+            lines = sys.stdout.getvalue().split("\n")
+            sys.stdin, sys.stdout = original_stdin, original_stdout
+            result = list(map(int, lines[1].split()))
+            _, _, offsets, cells = parse(text)
+            check_order(offsets, cells, result)
+            if int(lines[0]) != len(result) or len(result) != expected:
+                failures += 1
+                print(f"solve() found {lines[0]}, brute force {expected}", flush=True)
+        
+        # Past its deadline the decomposition gives up, and when it does not
+        # fit solve() takes the last input as one component
+        if conflict_components((len(offsets) - 1) // 2, offsets, cells, time.time() - 1) is not None:
+            failures += 1
+            print("conflict_components ignored its deadline", flush=True)
+        DECOMPOSE_ENTRY_COST = float('inf')
+        sys.stdin = StringIO(text)
+        sys.stdout = StringIO()
+        solve()
+        lines = sys.stdout.getvalue().split("\n")
+        sys.stdin, sys.stdout = original_stdin, original_stdout
+        check_order(offsets, cells, list(map(int, lines[1].split())))
+    finally:
+        MAX_EXECUTION_TIME, DECOMPOSE_ENTRY_COST = original_budget, original_cost
+        sys.stdin, sys.stdout = original_stdin, original_stdout
+    print("Components Status:", "PASSED" if failures == 0 else "FAILED", flush=True)
+
+def test_budget():
+    """Time a huge-path run of the command line, start-up and exit aside, against its budget."""
+    import subprocess
+    from benchmark import check_order, generate_transactions, parse, to_text
+    rng = random.Random(23)
+    n, budget = 30000, 1.5
+    text = to_text(n * 3 // 2, generate_transactions(rng, n, n * 3 // 2, 4, 2, "uniform", 0.05))
+    
+    def run(text):
+        start = time.time()
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--run", "--budget", str(budget)],
+                                input=text.encode(), capture_output=True, check=True).stdout.decode()
+        return time.time() - start, output.split("\n")
+    
+    # An empty input costs only start-up and exit
+    startup, _ = run("0 0\n")
+    seconds, lines = run(text)
+    _, _, offsets, cells = parse(text)
+    check_order(offsets, cells, list(map(int, lines[2].split())))
+    passed = seconds - startup <= budget
+    if not passed:
+        print(f"A run of {n} transactions took {seconds - startup:.2f}s of a {budget}s budget", flush=True)
+    print("Budget Status:", "PASSED" if passed else "FAILED", flush=True)
+
 if __name__ == "__main__":
     try:
+        # --budget SECONDS overrides the total time budget
+        if "--budget" in sys.argv:
+            MAX_EXECUTION_TIME = float(sys.argv[sys.argv.index("--budget") + 1])
+        # --telemetry FILE writes solver telemetry JSON there ("-" for stderr)
+        if "--telemetry" in sys.argv:
+            TELEMETRY_TARGET = sys.argv[sys.argv.index("--telemetry") + 1]
+        
         if len(sys.argv) > 1 and sys.argv[1] == "--run":
             print("Running in interactive mode...", flush=True)
-            solve()
+            # --workers N runs the improvement phase as a process portfolio
+            workers = 1
+            if "--workers" in sys.argv:
+                workers = int(sys.argv[sys.argv.index("--workers") + 1])
+            solve(workers)
         else:
             print("Running in test mode...", flush=True)
             test_solution()
+            test_exact_solver()
+            test_local_search()
+            test_portfolio()
+            test_components()
+            test_budget()
     except Exception as e:
         print(f"Error in main execution: {str(e)}", flush=True)
         import traceback